@@ -2,12 +2,16 @@
 Mus Programming Language.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from .core.lexer import Lexer, Token, TokenType, LexerError
 from .core.parser import Parser, Statement, ParserError
+from .core.resolver import Resolver
 from .core.interpreter import Interpreter, InterpreterError
 from .core.types import Environment
 
+# Number of parsed programs kept so identical source skips the front end
+PARSE_CACHE_SIZE = 128
+
 class Mus:
     """Main class for the Mus language."""
     
@@ -15,7 +19,9 @@ class Mus:
         self.interpreter = Interpreter()
         self.had_error = False
         self.had_runtime_error = False
-        self.debug = debug
+        # Running under python -O turns debug output off everywhere
+        self.debug = __debug__ and debug
+        self.parse_cache: Dict[str, List[Statement]] = {}
     
     def run_file(self, path: str) -> None:
         """Run a Mus program from a file."""
@@ -67,48 +73,69 @@ class Mus:
     
     def run(self, source: str) -> None:
         """Run a Mus program from source code."""
+        debug = self.debug
         try:
-            # Lexical analysis
-            if self.debug:
-                print("\nLexical analysis...")
-            lexer = Lexer(source)
-            tokens = lexer.scan_tokens()
-            if self.debug:
-                print("Tokens:", [str(token) for token in tokens])
-            
-            # Parsing
-            if self.debug:
-                print("\nParsing...")
-            parser = Parser(tokens)
-            statements = parser.parse()
-            
-            # Stop if there was a syntax error
-            if self.had_error:
-                return
+            # Identical source, such as a repeated REPL line, reuses its tree
+            statements = self.parse_cache.get(source)
+            if statements is None:
+                statements = self.parse(source, debug)
+                if statements is None:
+                    return
+                if len(self.parse_cache) >= PARSE_CACHE_SIZE:
+                    # Evict the oldest entry
+                    del self.parse_cache[next(iter(self.parse_cache))]
+                self.parse_cache[source] = statements
+            elif debug:
+                print("\nUsing cached parse...")
             
             # Interpretation
-            if self.debug:
+            if debug:
                 print("\nInterpreting...")
             self.interpreter.interpret(statements)
             
         except LexerError as e:
             self.error(e.line, e.column, str(e))
-            if self.debug:
+            if debug:
                 print(f"Lexer error details: {e}")
         except ParserError as e:
             self.error(e.token.line, e.token.column, str(e))
-            if self.debug:
+            if debug:
                 print(f"Parser error details: {e}")
         except InterpreterError as e:
             self.runtime_error(e)
-            if self.debug:
+            if debug:
                 print(f"Interpreter error details: {e}")
         except Exception as e:
             print(f"Unexpected error: {str(e)}")
-            if self.debug:
+            if debug:
                 import traceback
                 traceback.print_exc()
     
+    def parse(self, source: str, debug: bool) -> Optional[List[Statement]]:
+        """Lex, parse and resolve source code, or return None on a syntax error."""
+        # Lexical analysis
+        if debug:
+            print("\nLexical analysis...")
+        lexer = Lexer(source)
+        tokens = lexer.scan_tokens()
+        if debug:
+            print("Tokens:", [str(token) for token in tokens])
+        
+        # Parsing
+        if debug:
+            print("\nParsing...")
+        parser = Parser(tokens)
+        statements = parser.parse()
+        
+        # Stop if there was a syntax error
+        if self.had_error:
+            return None
+        
+        # Resolve local variables to scope slots. Resolution depends only on
+        # the tree, so a cached tree doesn't need resolving again.
+        Resolver(self.interpreter).resolve(statements)
+        return statements
+    
     def error(self, line: int, column: int, message: str) -> None:
         """Report an error."""
         self.report(line, column, "", message)
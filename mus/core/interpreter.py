@@ -2,38 +2,135 @@
 Interpreter for the Mus Programming Language.
 """
 
+import sys
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from .lexer import Token, TokenType
 from .parser import (
-    Expression, Statement, Binary, Unary, Literal, Variable,
-    This, Super, Call, Get, Set, ExpressionStmt, VarDeclaration,
+    Expression, Statement, Binary, Unary, Literal, Variable, Assign,
+    This, Super, Call, Get, Set, IndexGet, IndexSet, Index, IndexAssign,
+    ExpressionStmt, VarDeclaration,
     FunctionDeclaration, ClassDeclaration, Block, If, While, For, Return
 )
 from .types import (
     MusType, MusInt, MusString, MusBool, MusArray,
     MusFunction, MusClass, MusObject, Environment
 )
+from .jit import HOT_LOOP_ITERATIONS, compile_loop
+from .operators import BINARY_OPERATORS, NUMBER_TYPES, InterpreterError, values_equal
 
-class InterpreterError(Exception):
-    """Exception raised for interpreter errors."""
-    def __init__(self, message: str, token: Token):
-        self.message = message
-        self.token = token
-        super().__init__(f"{message} at line {token.line}, column {token.column}")
+# Maximum number of memoized results kept per pure function
+CALL_CACHE_SIZE = 1024
 
-class ReturnValue(Exception):
-    """Used to handle return statements."""
-    def __init__(self, value: Any):
-        self.value = value
+# Argument types that can safely key the call cache. Booleans and floats are
+# left out because they compare equal to ints (True == 1, 1 == 1.0).
+MEMOIZABLE_TYPES = frozenset((int, str))
+
+_MISS = object()
+
+def is_pure_function(declaration: FunctionDeclaration) -> bool:
+    """Check whether a function's result depends only on its arguments.
+    
+    A function is pure when it reads nothing but its parameters and its own
+    locals, assigns nothing outside itself, and calls nothing but itself.
+    A self-call is looked up by name when it runs, so callers must also
+    check that the name still reaches this function (see calls_itself).
+    """
+    scopes = [{name for name, _ in declaration.params}]
+    
+    def is_local(name: str) -> bool:
+        return any(name in scope for scope in scopes)
+    
+    def check_expr(expr: Expression) -> bool:
+        if isinstance(expr, Literal):
+            # Array literals build a fresh mutable value on every call
+            return not isinstance(expr.value, list)
+        if isinstance(expr, Variable):
+            return is_local(expr.name) or expr.name == declaration.name
+        if isinstance(expr, Binary):
+            return check_expr(expr.left) and check_expr(expr.right)
+        if isinstance(expr, Unary):
+            return check_expr(expr.right)
+        if isinstance(expr, Call):
+            # A callee the resolver bound to a local slot is a variable that
+            # happens to share the function's name, not the function itself
+            return (isinstance(expr.callee, Variable)
+                    and expr.callee.name == declaration.name
+                    and expr.callee.resolved_depth < 0
+                    and not is_local(declaration.name)
+                    and all(check_expr(arg) for arg in expr.arguments))
+        return False
+    
+    def check_stmt(stmt: Statement) -> bool:
+        if isinstance(stmt, ExpressionStmt):
+            return check_expr(stmt.expression)
+        if isinstance(stmt, VarDeclaration):
+            if stmt.initializer and not check_expr(stmt.initializer):
+                return False
+            scopes[-1].add(stmt.name)
+            return True
+        if isinstance(stmt, Return):
+            return stmt.value is None or check_expr(stmt.value)
+        if isinstance(stmt, If):
+            return (check_expr(stmt.condition)
+                    and check_stmt(stmt.then_branch)
+                    and (stmt.else_branch is None or check_stmt(stmt.else_branch)))
+        if isinstance(stmt, While):
+            return check_expr(stmt.condition) and check_stmt(stmt.body)
+        if isinstance(stmt, Block):
+            scopes.append(set())
+            try:
+                return all(check_stmt(s) for s in stmt.statements)
+            finally:
+                scopes.pop()
+        return False
+    
+    return all(check_stmt(stmt) for stmt in declaration.body)
 
 class Interpreter:
     """Interpreter for the Mus language."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.globals = Environment()
         self.environment = self.globals
-        self.locals: Dict[Expression, int] = {}
+        
+        # A return statement sets these; enclosing blocks and loops stop
+        # executing until the function call consumes the value
+        self.returning = False
+        self.return_value: Any = None
+        
+        # Call frames that nothing refers to any more, ready for reuse
+        self.frame_pool: List[Environment] = []
+        
+        # Dispatch tables keyed by node class, built once so that each node
+        # costs a single dict lookup instead of a `match` cascade.
+        self.statement_handlers: Dict[type, Callable[[Any], None]] = {
+            ExpressionStmt: self.execute_expression_stmt,
+            VarDeclaration: self.execute_var_declaration,
+            FunctionDeclaration: self.execute_function_declaration,
+            ClassDeclaration: self.execute_class_declaration,
+            Block: self.execute_block_stmt,
+            If: self.execute_if,
+            While: self.execute_while,
+            For: self.execute_for,
+            Return: self.execute_return,
+        }
+        self.expression_handlers: Dict[type, Callable[[Any], Any]] = {
+            Literal: self.evaluate_literal,
+            Variable: self.evaluate_variable,
+            Assign: self.evaluate_assign,
+            This: self.evaluate_this,
+            Super: self.evaluate_super,
+            Binary: self.evaluate_binary,
+            Unary: self.evaluate_unary,
+            Call: self.evaluate_call,
+            Get: self.evaluate_get,
+            Set: self.evaluate_set,
+            IndexGet: self.evaluate_index_get,
+            IndexSet: self.evaluate_index_set,
+            Index: self.evaluate_index,
+            IndexAssign: self.evaluate_index_assign,
+        }
         
         # Define built-in functions
         self.define_builtins()
@@ -43,7 +140,9 @@ class Interpreter:
         def out_func(args: List[Any]) -> None:
             if len(args) != 1:
                 raise RuntimeError("Function 'out' expects exactly one argument")
-            print(str(args[0]))
+            # One write instead of print's separate value and newline writes;
+            # sys.stdout is looked up per call so redirection still works
+            sys.stdout.write(str(args[0]) + "\n")
             return None
         
         def array_length_func(args: List[Any]) -> int:
@@ -66,6 +165,10 @@ class Interpreter:
         try:
             for statement in statements:
                 self.execute(statement)
+                if self.returning:
+                    self.returning = False
+                    self.return_value = None
+                    raise InterpreterError("Cannot return from top-level code", Token(TokenType.EOF, "", None, 0, 0))
         except Exception as e:
             if not isinstance(e, InterpreterError):
                 raise InterpreterError(str(e), Token(TokenType.EOF, "", None, 0, 0))
@@ -73,241 +176,389 @@ class Interpreter:
     
     def execute(self, stmt: Statement) -> None:
         """Execute a statement."""
-        match stmt:
-            case ExpressionStmt(expression):
-                self.evaluate(expression)
-            case VarDeclaration(name, type_name, initializer, token):
-                value = None
-                if initializer:
-                    value = self.evaluate(initializer)
-                    
-                    # Handle array type declarations
-                    if type_name.startswith("array<") and type_name.endswith(">"):
-                        element_type = type_name[6:-1]  # Extract the element type
-                        if not isinstance(value, MusArray):
-                            value = MusArray(value if isinstance(value, list) else [value], element_type)
-                
-                self.environment.define_variable(name, type_name, value)
-            case FunctionDeclaration(name, params, body, token):
-                function = MusFunction(name, params, body, self.environment)
-                self.environment.define_function(name, params, body)
-            case ClassDeclaration(name, superclass, fields, methods, token):
-                # Evaluate superclass if it exists
-                parent = None
-                if superclass:
-                    parent_class = self.environment.get_class(superclass)
-                    if not parent_class:
-                        raise InterpreterError(f"Superclass '{superclass}' not found", token)
-                    parent = parent_class
-                
-                # Create class fields
-                class_fields = {}
-                for field in fields:
-                    value = None
-                    if field.initializer:
-                        value = self.evaluate(field.initializer)
-                    class_fields[field.name] = (field.type_name, value)
-                
-                # Create class methods
-                class_methods = {}
-                for method in methods:
-                    function = MusFunction(method.name, method.params, method.body, self.environment)
-                    class_methods[method.name] = function
-                
-                # Create and register the class
-                class_def = self.environment.define_class(name, class_fields, class_methods, parent)
-            case Block(statements):
-                self.execute_block(statements, Environment(self.environment))
-            case If(condition, then_branch, else_branch):
-                if self.is_truthy(self.evaluate(condition)):
-                    self.execute(then_branch)
-                elif else_branch:
-                    self.execute(else_branch)
-            case While(condition, body):
-                while self.is_truthy(self.evaluate(condition)):
-                    self.execute(body)
-            case For(iterator, iterable, body):
-                iterable_value = self.evaluate(iterable)
-                if not isinstance(iterable_value, list):
-                    raise InterpreterError("Can only iterate over arrays", Token(TokenType.EOF, "", None, 0, 0))
-                
-                for item in iterable_value:
-                    env = Environment(self.environment)
-                    env.define_variable(iterator, "any", item)
-                    self.execute_block([body], env)
-            case Return(value, token):
-                return_value = None
-                if value:
-                    return_value = self.evaluate(value)
-                raise ReturnValue(return_value)
-            case _:
-                raise InterpreterError(f"Unknown statement type: {type(stmt)}", Token(TokenType.EOF, "", None, 0, 0))
+        handler = self.statement_handlers.get(type(stmt))
+        if handler is None:
+            raise InterpreterError(f"Unknown statement type: {type(stmt)}", Token(TokenType.EOF, "", None, 0, 0))
+        handler(stmt)
+    
+    def execute_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        """Execute an expression statement."""
+        self.evaluate(stmt.expression)
+    
+    def execute_var_declaration(self, stmt: VarDeclaration) -> None:
+        """Execute a variable declaration."""
+        value = None
+        if stmt.initializer:
+            value = self.evaluate(stmt.initializer)
+            
+            # Handle array type declarations; arrays are never wrapped twice
+            element_type = stmt.element_type
+            if element_type is not None and not isinstance(value, MusArray):
+                value = MusArray.create(value if isinstance(value, list) else [value], element_type)
+        
+        if stmt.slot >= 0:
+            self.environment.values[stmt.slot] = value
+        else:
+            self.environment.define_variable(stmt.name, stmt.type_name, value)
+    
+    def execute_function_declaration(self, stmt: FunctionDeclaration) -> None:
+        """Execute a function declaration."""
+        function = MusFunction(stmt.name, stmt.params, stmt.body, self.environment,
+                               nlocals=stmt.nlocals, captures_frame=stmt.captures_frame)
+        function.is_pure = is_pure_function(stmt)
+        self.environment.functions[stmt.name] = function
+    
+    def execute_class_declaration(self, stmt: ClassDeclaration) -> None:
+        """Execute a class declaration."""
+        # Evaluate superclass if it exists
+        parent = None
+        if stmt.superclass:
+            parent_class = self.environment.get_class(stmt.superclass)
+            if not parent_class:
+                raise InterpreterError(f"Superclass '{stmt.superclass}' not found", stmt.token)
+            parent = parent_class
+        
+        # Create class fields
+        class_fields = {}
+        for field in stmt.fields:
+            value = None
+            if field.initializer:
+                value = self.evaluate(field.initializer)
+            class_fields[field.name] = (field.type_name, value)
+        
+        # Create class methods
+        class_methods = {}
+        for method in stmt.methods:
+            function = MusFunction(method.name, method.params, method.body, self.environment,
+                                   nlocals=method.nlocals, captures_frame=method.captures_frame)
+            class_methods[method.name] = function
+        
+        # Create and register the class
+        class_def = self.environment.define_class(stmt.name, class_fields, class_methods, parent)
+        for function in class_methods.values():
+            function.owner = class_def
+    
+    def execute_block_stmt(self, stmt: Block) -> None:
+        """Execute a block statement in a new scope."""
+        self.execute_block(stmt.statements, Environment(self.environment, values=[None] * stmt.nlocals))
+    
+    def execute_if(self, stmt: If) -> None:
+        """Execute an if statement."""
+        if self.is_truthy(self.evaluate(stmt.condition)):
+            self.execute(stmt.then_branch)
+        elif stmt.else_branch:
+            self.execute(stmt.else_branch)
+    
+    def execute_while(self, stmt: While) -> None:
+        """Execute a while loop."""
+        kernel = stmt.kernel
+        if kernel and kernel.run(self):
+            return
+
+        # Bind the hot-loop lookups once instead of per iteration
+        evaluate = self.evaluate
+        execute = self.execute
+        is_truthy = self.is_truthy
+        condition = stmt.condition
+        body = stmt.body
+        counting = kernel is None
+        while is_truthy(evaluate(condition)):
+            execute(body)
+            if self.returning:
+                break
+            if counting:
+                stmt.hits += 1
+                if stmt.hits >= HOT_LOOP_ITERATIONS:
+                    # The kernel picks the loop up from the current values
+                    # of its variables, so it can take over mid-loop
+                    counting = False
+                    stmt.kernel = compile_loop(stmt) or False
+                    if stmt.kernel and stmt.kernel.run(self):
+                        return
+    
+    def execute_for(self, stmt: For) -> None:
+        """Execute a for loop over an array."""
+        iterable_value = self.evaluate(stmt.iterable)
+        if not isinstance(iterable_value, (list, MusArray)):
+            raise InterpreterError("Can only iterate over arrays", Token(TokenType.EOF, "", None, 0, 0))
+        
+        # One scope serves every iteration; only the iterator slot changes.
+        # Like the C-style for loop, closures see the iterator's latest value.
+        env = Environment(self.environment, values=[None])
+        values = env.values
+        execute = self.execute
+        body = stmt.body
+        previous = self.environment
+        try:
+            self.environment = env
+            for item in iterable_value:
+                values[0] = item
+                execute(body)
+                if self.returning:
+                    break
+        finally:
+            self.environment = previous
+    
+    def execute_return(self, stmt: Return) -> None:
+        """Execute a return statement."""
+        return_value = None
+        if stmt.value:
+            return_value = self.evaluate(stmt.value)
+        self.return_value = return_value
+        self.returning = True
     
     def evaluate(self, expr: Expression) -> Any:
         """Evaluate an expression."""
-        match expr:
-            case Literal(value, _):
+        handler = self.expression_handlers.get(type(expr))
+        if handler is None:
+            raise InterpreterError(f"Unknown expression type: {type(expr)}", Token(TokenType.EOF, "", None, 0, 0))
+        return handler(expr)
+    
+    def evaluate_literal(self, expr: Literal) -> Any:
+        """Evaluate a literal."""
+        value = expr.value
+        if type(value) is list:
+            # Array literals hold their element expressions
+            return [self.evaluate(element) for element in value]
+        return value
+    
+    def evaluate_variable(self, expr: Variable) -> Any:
+        """Evaluate a variable reference."""
+        return self.lookup_variable(expr.name, expr)
+    
+    def evaluate_assign(self, expr: Assign) -> Any:
+        """Evaluate a variable assignment."""
+        value = self.evaluate(expr.value)
+        distance = expr.resolved_depth
+        if distance >= 0:
+            self.environment.assign_at(distance, expr.slot, value)
+        else:
+            self.globals.set_variable(expr.name, value)
+        return value
+    
+    def evaluate_this(self, expr: This) -> Any:
+        """Evaluate a 'this' reference."""
+        return self.lookup_variable("this", expr)
+    
+    def evaluate_super(self, expr: Super) -> Any:
+        """Evaluate a 'super' method reference."""
+        token = expr.token
+        distance = expr.resolved_depth
+        if distance < 0:
+            raise InterpreterError("'super' reference not available", token)
+        
+        superclass = self.environment.get_at(distance, expr.slot)
+        if not superclass:
+            raise InterpreterError("Superclass not found", token)
+        
+        method_func = superclass.get_method(expr.method)
+        if not method_func:
+            raise InterpreterError(f"Method '{expr.method}' not found in superclass", token)
+        
+        # 'this' shares the bound-method scope with 'super', at slot 0
+        return method_func.bind(self.environment.get_at(distance, 0))
+    
+    def evaluate_binary(self, expr: Binary) -> Any:
+        """Evaluate a binary operation."""
+        operator = expr.operator
+        op_fn = expr.op_fn
+        if op_fn is None:
+            raise InterpreterError(f"Unknown operator: {operator.lexeme}", operator)
+        return op_fn(operator, self.evaluate(expr.left), self.evaluate(expr.right))
+    
+    def evaluate_unary(self, expr: Unary) -> Any:
+        """Evaluate a unary operation."""
+        operator = expr.operator
+        right_val = self.evaluate(expr.right)
+        
+        if operator.type == TokenType.MINUS:
+            self.check_number_operand(operator, right_val)
+            return -right_val
+        if operator.type == TokenType.NOT:
+            return not self.is_truthy(right_val)
+        raise InterpreterError(f"Unknown operator: {operator.lexeme}", operator)
+    
+    def evaluate_call(self, expr: Call) -> Any:
+        """Evaluate a function call or class instantiation."""
+        callee_val = self.evaluate(expr.callee)
+        arguments = expr.arguments
+        
+        if isinstance(callee_val, MusFunction):
+            # Evaluate arguments. Most calls (including out and length) take
+            # one or two, which skips building and running a comprehension.
+            nargs = len(arguments)
+            if nargs == 1:
+                args = [self.evaluate(arguments[0])]
+            elif nargs == 2:
+                args = [self.evaluate(arguments[0]), self.evaluate(arguments[1])]
+            else:
+                args = [self.evaluate(arg) for arg in arguments]
+            
+            if callee_val.native_fn is not None:
+                # Call native function
+                return callee_val.native_fn(args)
+            
+            if (callee_val.is_pure and all(type(arg) in MEMOIZABLE_TYPES for arg in args)
+                    and self.calls_itself(callee_val)):
+                # Pure functions are memoized on their arguments
+                key = tuple(args)
+                cache = callee_val.call_cache
+                result = cache.get(key, _MISS)
+                if result is _MISS:
+                    result = self.call_function(callee_val, args)
+                    if len(cache) >= CALL_CACHE_SIZE:
+                        # Evict the oldest entry
+                        del cache[next(iter(cache))]
+                    cache[key] = result
+                return result
+            
+            return self.call_function(callee_val, args)
+        elif isinstance(callee_val, MusClass):
+            # Create a new instance of the class
+            instance = callee_val.create_instance(self)
+            
+            # Call the constructor if it exists
+            init_method = callee_val.get_method("init")
+            if init_method:
+                bound_init = init_method.bind(instance)
+                args = [self.evaluate(arg) for arg in arguments]
+                # Return values from constructors are ignored
+                self.call_function(bound_init, args)
+            
+            return instance
+        else:
+            raise InterpreterError("Can only call functions and classes", expr.token)
+    
+    def call_function(self, function: MusFunction, args: List[Any]) -> Any:
+        """Call a user-defined function and return its result."""
+        # The resolver numbers parameters first, so the arguments fill
+        # slots 0..n-1 and the remaining locals start out as None. Callers
+        # pass a freshly built list, so it becomes the frame itself unless
+        # it holds surplus arguments.
+        nparams = len(function.params)
+        values = args if len(args) <= nparams else args[:nparams]
+        padding = function.nlocals - len(values)
+        if padding:
+            values += [None] * padding
+        
+        # Create new environment for function execution
+        closure = function.closure if function.closure else self.globals
+        reuse_frame = not function.captures_frame
+        if reuse_frame:
+            # Calls nest strictly, so a pooled frame is never still in use.
+            # Locals live in slots, so its dicts are still empty.
+            frame_pool = self.frame_pool
+            env = frame_pool.pop() if frame_pool else Environment()
+            env.parent = closure
+            env.values = values
+        else:
+            env = Environment(closure, values=values)
+        
+        # Execute function body
+        self.execute_block(function.body, env)
+        if reuse_frame:
+            self.frame_pool.append(env)
+        if not self.returning:
+            return None
+        return_value = self.return_value
+        self.returning = False
+        self.return_value = None
+        return return_value
+    
+    def evaluate_get(self, expr: Get) -> Any:
+        """Evaluate a property access."""
+        name = expr.name
+        obj = self.evaluate(expr.object)
+        if isinstance(obj, MusArray):
+            # Handle array methods
+            if name == "length":
+                return obj.length()
+            # Indexing parses to its own nodes, so any other name is unknown
+            raise InterpreterError(f"Unknown array method: {name}", expr.token)
+        elif isinstance(obj, MusObject):
+            value = obj.fields.get(name, _MISS)
+            if value is not _MISS:
                 return value
-            case Variable(name, token):
-                return self.lookup_variable(name, expr)
-            case This(token):
-                return self.lookup_variable("this", expr)
-            case Super(method, token):
-                distance = self.locals.get(expr)
-                if distance is None:
-                    raise InterpreterError("'super' reference not available", token)
-                
-                superclass = self.environment.get_class(self.environment.get_variable("super"))
-                if not superclass:
-                    raise InterpreterError("Superclass not found", token)
-                
-                method_func = superclass.get_method(method)
-                if not method_func:
-                    raise InterpreterError(f"Method '{method}' not found in superclass", token)
-                
-                return method_func
-            case Binary(left, operator, right):
-                left_val = self.evaluate(left)
-                right_val = self.evaluate(right)
-                
-                match operator.type:
-                    case TokenType.PLUS:
-                        if isinstance(left_val, (int, float)) and isinstance(right_val, (int, float)):
-                            return left_val + right_val
-                        if isinstance(left_val, str) or isinstance(right_val, str):
-                            return str(left_val) + str(right_val)
-                        raise InterpreterError("Operands must be numbers or strings", operator)
-                    case TokenType.MINUS:
-                        self.check_number_operands(operator, left_val, right_val)
-                        return left_val - right_val
-                    case TokenType.MULTIPLY:
-                        self.check_number_operands(operator, left_val, right_val)
-                        return left_val * right_val
-                    case TokenType.DIVIDE:
-                        self.check_number_operands(operator, left_val, right_val)
-                        if right_val == 0:
-                            raise InterpreterError("Division by zero", operator)
-                        return left_val / right_val
-                    case TokenType.MODULO:
-                        self.check_number_operands(operator, left_val, right_val)
-                        if right_val == 0:
-                            raise InterpreterError("Modulo by zero", operator)
-                        return left_val % right_val
-                    case TokenType.GREATER:
-                        self.check_number_operands(operator, left_val, right_val)
-                        return left_val > right_val
-                    case TokenType.GREATER_EQUAL:
-                        self.check_number_operands(operator, left_val, right_val)
-                        return left_val >= right_val
-                    case TokenType.LESS:
-                        self.check_number_operands(operator, left_val, right_val)
-                        return left_val < right_val
-                    case TokenType.LESS_EQUAL:
-                        self.check_number_operands(operator, left_val, right_val)
-                        return left_val <= right_val
-                    case TokenType.EQUALS:
-                        return self.is_equal(left_val, right_val)
-                    case TokenType.NOT_EQUALS:
-                        return not self.is_equal(left_val, right_val)
-                    case _:
-                        raise InterpreterError(f"Unknown operator: {operator.type}", operator)
-            case Unary(operator, right):
-                right_val = self.evaluate(right)
-                
-                match operator.type:
-                    case TokenType.MINUS:
-                        self.check_number_operand(operator, right_val)
-                        return -right_val
-                    case TokenType.NOT:
-                        return not self.is_truthy(right_val)
-                    case _:
-                        raise InterpreterError(f"Unknown operator: {operator.type}", operator)
-            case Call(callee, arguments, token):
-                callee_val = self.evaluate(callee)
-                
-                if isinstance(callee_val, MusFunction):
-                    # Evaluate arguments
-                    args = [self.evaluate(arg) for arg in arguments]
-                    
-                    if hasattr(callee_val, 'native_fn'):
-                        # Call native function
-                        return callee_val.native_fn(args)
-                    else:
-                        # Create new environment for function execution
-                        env = Environment(callee_val.closure if callee_val.closure else self.globals)
-                        
-                        # Bind parameters to arguments
-                        for (param_name, param_type), arg_value in zip(callee_val.params, args):
-                            env.define_variable(param_name, param_type, arg_value)
-                        
-                        try:
-                            # Execute function body
-                            self.execute_block(callee_val.body, env)
-                            return None
-                        except ReturnValue as return_value:
-                            return return_value.value
-                elif isinstance(callee_val, MusClass):
-                    # Create a new instance of the class
-                    instance = callee_val.create_instance(self)
-                    
-                    # Call the constructor if it exists
-                    init_method = callee_val.get_method("init")
-                    if init_method:
-                        bound_init = init_method.bind(instance)
-                        args = [self.evaluate(arg) for arg in arguments]
-                        bound_init.native_fn = None  # Ensure we don't treat it as a native function
-                        
-                        # Create new environment for constructor execution
-                        env = Environment(bound_init.closure if bound_init.closure else self.globals)
-                        
-                        # Bind parameters to arguments
-                        for (param_name, param_type), arg_value in zip(bound_init.params, args):
-                            env.define_variable(param_name, param_type, arg_value)
-                        
-                        try:
-                            # Execute constructor body
-                            self.execute_block(bound_init.body, env)
-                        except ReturnValue:
-                            pass  # Ignore return values from constructors
-                    
-                    return instance
-                else:
-                    raise InterpreterError("Can only call functions and classes", token)
-            case Get(object, name, token):
-                obj = self.evaluate(object)
-                if isinstance(obj, MusArray):
-                    # Handle array methods
-                    if name == "length":
-                        return obj.length()
-                    # Handle array indexing
-                    try:
-                        index = int(name)
-                        return obj.get(index)
-                    except ValueError:
-                        raise InterpreterError(f"Unknown array method: {name}", token)
-                elif isinstance(obj, MusObject):
-                    return obj.get_field(name)
-                else:
-                    raise InterpreterError("Only instances have properties", token)
-            case Set(object, name, value, token):
-                obj = self.evaluate(object)
-                if isinstance(obj, MusArray):
-                    # Handle array index assignment
-                    try:
-                        index = int(name)
-                        value_val = self.evaluate(value)
-                        obj.set(index, value_val)
-                        return value_val
-                    except ValueError:
-                        raise InterpreterError(f"Invalid array index: {name}", token)
-                elif isinstance(obj, MusObject):
-                    value_val = self.evaluate(value)
-                    obj.set_field(name, value_val)
-                    return value_val
-                else:
-                    raise InterpreterError("Only instances have fields", token)
-            case _:
-                raise InterpreterError(f"Unknown expression type: {type(expr)}", Token(TokenType.EOF, "", None, 0, 0))
+            class_def = obj.class_def
+            if class_def is expr.ic_class:
+                return obj.bind_method(name, expr.ic_method)
+            method = class_def.get_method(name)
+            if method:
+                # Classes don't change after declaration, so the method
+                # stays valid for as long as the same class shows up here
+                expr.ic_class = class_def
+                expr.ic_method = method
+                return obj.bind_method(name, method)
+            return obj.get_field(name)
+        else:
+            raise InterpreterError("Only instances have properties", expr.token)
+    
+    def evaluate_set(self, expr: Set) -> Any:
+        """Evaluate a property assignment."""
+        name = expr.name
+        obj = self.evaluate(expr.object)
+        if isinstance(obj, MusArray):
+            raise InterpreterError(f"Invalid array index: {name}", expr.token)
+        elif isinstance(obj, MusObject):
+            value_val = self.evaluate(expr.value)
+            obj.set_field(name, value_val)
+            return value_val
+        else:
+            raise InterpreterError("Only instances have fields", expr.token)
+    
+    def array_operand(self, obj: Any, token: Token) -> MusArray:
+        """Get the array an index expression works on."""
+        # Array literals stored in untyped variables stay plain lists; a
+        # MusArray over the same list reads and writes it in place
+        if type(obj) is list:
+            return MusArray(obj, "any")
+        raise InterpreterError("Only arrays can be indexed", token)
+    
+    def evaluate_index_get(self, expr: IndexGet) -> Any:
+        """Evaluate an array access with a constant index."""
+        obj = self.evaluate(expr.object)
+        if not isinstance(obj, MusArray):
+            obj = self.array_operand(obj, expr.token)
+        try:
+            return obj.get(expr.index)
+        except IndexError as error:
+            raise InterpreterError(str(error), expr.token)
+    
+    def evaluate_index_set(self, expr: IndexSet) -> Any:
+        """Evaluate an array assignment with a constant index."""
+        obj = self.evaluate(expr.object)
+        if not isinstance(obj, MusArray):
+            obj = self.array_operand(obj, expr.token)
+        value_val = self.evaluate(expr.value)
+        try:
+            obj.set(expr.index, value_val)
+        except IndexError as error:
+            raise InterpreterError(str(error), expr.token)
+        return value_val
+    
+    def evaluate_index(self, expr: Index) -> Any:
+        """Evaluate an array access with a computed index."""
+        obj = self.evaluate(expr.object)
+        if not isinstance(obj, MusArray):
+            obj = self.array_operand(obj, expr.token)
+        index = self.evaluate(expr.index)
+        try:
+            return obj.get(index)
+        except (IndexError, TypeError) as error:
+            raise InterpreterError(str(error), expr.token)
+    
+    def evaluate_index_assign(self, expr: IndexAssign) -> Any:
+        """Evaluate an array assignment with a computed index."""
+        obj = self.evaluate(expr.object)
+        if not isinstance(obj, MusArray):
+            obj = self.array_operand(obj, expr.token)
+        index = self.evaluate(expr.index)
+        value_val = self.evaluate(expr.value)
+        try:
+            obj.set(index, value_val)
+        except (IndexError, TypeError) as error:
+            raise InterpreterError(str(error), expr.token)
+        return value_val
     
     def execute_block(self, statements: List[Statement], environment: Environment) -> None:
         """Execute a block of statements in the given environment."""
@@ -316,42 +567,55 @@ class Interpreter:
             self.environment = environment
             for statement in statements:
                 self.execute(statement)
+                if self.returning:
+                    break
         finally:
             self.environment = previous
     
-    def lookup_variable(self, name: str, expr: Expression) -> Any:
+    def calls_itself(self, function: MusFunction) -> bool:
+        """Check whether a pure function's self-calls still reach it."""
+        # Self-calls are unresolved names, looked up the way lookup_variable
+        # does from the function's frame. Pure functions declare nothing, so
+        # the search starts at the closure. Redeclaring the function or
+        # shadowing it with a global makes the cached results stale.
+        name = function.name
+        target = self.globals.get_variable(name)
+        if target is None:
+            closure = function.closure if function.closure else self.globals
+            target = closure.get_function(name) or closure.get_class(name)
+        return target is function
+    
+    def lookup_variable(self, name: str, expr: Any) -> Any:
         """Look up a variable in the appropriate scope."""
-        distance = self.locals.get(expr)
-        if distance is not None:
-            return self.environment.get_at(distance, name)
-        return self.globals.get_variable(name)
+        # expr is any node the resolver annotates with a depth and slot
+        distance = expr.resolved_depth
+        if distance >= 0:
+            return self.environment.get_at(distance, expr.slot)
+        value = self.globals.get_variable(name)
+        if value is None:
+            # Functions and classes are kept in their own tables
+            value = self.environment.get_function(name) or self.environment.get_class(name)
+        return value
     
-    def resolve(self, expr: Expression, depth: int) -> None:
+    def resolve(self, expr: Any, depth: int) -> None:
         """Resolve a variable reference to its scope."""
-        self.locals[expr] = depth
+        expr.resolved_depth = depth
     
     def is_truthy(self, value: Any) -> bool:
         """Determine if a value is truthy."""
-        if value is None:
-            return False
-        if isinstance(value, bool):
-            return value
-        return True
+        # Only None and false are falsy
+        return value is not None and value is not False
     
     def is_equal(self, a: Any, b: Any) -> bool:
         """Compare two values for equality."""
-        if a is None and b is None:
-            return True
-        if a is None:
-            return False
-        return a == b
+        return values_equal(a, b)
     
     def check_number_operand(self, operator: Token, operand: Any) -> None:
         """Check if an operand is a number."""
-        if not isinstance(operand, (int, float)):
+        if type(operand) not in NUMBER_TYPES:
             raise InterpreterError("Operand must be a number", operator)
     
     def check_number_operands(self, operator: Token, left: Any, right: Any) -> None:
         """Check if both operands are numbers."""
-        if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+        if type(left) not in NUMBER_TYPES or type(right) not in NUMBER_TYPES:
             raise InterpreterError("Operands must be numbers", operator) 
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Numeric loop compiler for the Mus Programming Language.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from .lexer import TokenType
+from .parser import (
+    Expression, Statement, Binary, Unary, Literal, Variable, Assign,
+    ExpressionStmt, Block, While
+)
+
+try:
+    import numba
+except ImportError:
+    numba = None  # type: ignore[assignment]
+
+# Operators a numeric kernel can evaluate, mapped to their Python spelling
+ARITHMETIC_OPERATORS = {
+    TokenType.PLUS: '+',
+    TokenType.MINUS: '-',
+    TokenType.MULTIPLY: '*',
+    TokenType.DIVIDE: '/',
+    TokenType.MODULO: '%',
+}
+
+COMPARISON_OPERATORS = {
+    TokenType.GREATER: '>',
+    TokenType.GREATER_EQUAL: '>=',
+    TokenType.LESS: '<',
+    TokenType.LESS_EQUAL: '<=',
+    TokenType.EQUALS: '==',
+    TokenType.NOT_EQUALS: '!=',
+}
+
+# Iterations a loop is interpreted for before it is compiled. Loops that
+# only run a few times never pay for generating and compiling a kernel.
+HOT_LOOP_ITERATIONS = 50
+
+# A loop variable is either a resolved local (distance, slot) relative to the
+# environment the loop runs in, or a global name.
+Location = Union[Tuple[int, int], str]
+
+class NotCompilable(Exception):
+    """Raised while lowering a loop that is not purely numeric."""
+
+def float_valued(expr: Expression) -> bool:
+    """Whether a numeric expression is a float whenever its variables are.
+
+    Only integer literals bring integers into a loop over floats, so an
+    expression without them always gives a float.
+    """
+    if isinstance(expr, Literal):
+        return type(expr.value) is float
+    if isinstance(expr, Unary):
+        return float_valued(expr.right)
+    if isinstance(expr, Binary):
+        return float_valued(expr.left) and float_valued(expr.right)
+    return True
+
+class LoopKernel:
+    """A `while` loop lowered to a Python function over its numeric variables.
+
+    The kernel takes the current value of every variable the loop touches
+    and returns their final values, so the interpreter only reads the
+    variables before the loop and writes them back once afterwards.
+    """
+
+    def __init__(self, function: Callable[..., Tuple[Any, ...]], locations: List[Location],
+                 float_function: Optional[Callable[..., Tuple[Any, ...]]] = None):
+        self.function = function
+        self.locations = locations
+        self.float_function = float_function
+
+    def run(self, interpreter: Any) -> bool:
+        """Run the loop in the interpreter's current environment.
+
+        Returns False without side effects when the loop has to be
+        interpreted instead: a variable is not a number, or the arithmetic
+        raised (e.g. division by zero) and the interpreter should report it.
+        """
+        environment = interpreter.environment
+        args = []
+        all_floats = True
+        for location in self.locations:
+            if type(location) is str:
+                value = interpreter.globals.get_variable(location)
+            else:
+                value = environment.get_at(*location)
+            value_type = type(value)
+            if value_type is not int and value_type is not float:
+                return False
+            all_floats = all_floats and value_type is float
+            args.append(value)
+
+        # The native kernel works on machine floats; ints stay in Python so
+        # they keep arbitrary precision.
+        function = self.float_function if all_floats and self.float_function else self.function
+        try:
+            results = function(*args)
+        except ArithmeticError:
+            return False
+
+        for location, value in zip(self.locations, results):
+            if type(location) is str:
+                interpreter.globals.set_variable(location, value)
+            else:
+                environment.assign_at(location[0], location[1], value)
+        return True
+
+class LoopCompiler:
+    """Lowers numeric `while` loops to Python source."""
+
+    def __init__(self) -> None:
+        self.names: Dict[Location, str] = {}
+        # numba stores every assignment to a float variable as a float, so
+        # the native kernel is only used when no assignment gives an int
+        self.float_only = True
+
+    def variable(self, expr: Union[Variable, Assign], name: str, depth_offset: int) -> str:
+        """Map a variable reference to its kernel argument name."""
+        distance = expr.resolved_depth
+        location: Location = name if distance < 0 else (distance - depth_offset, expr.slot)
+        if location not in self.names:
+            self.names[location] = f"v{len(self.names)}"
+        return self.names[location]
+
+    def arithmetic(self, expr: Expression, depth_offset: int) -> str:
+        """Lower a numeric expression."""
+        if isinstance(expr, Literal):
+            if type(expr.value) is not int and type(expr.value) is not float:
+                raise NotCompilable()
+            # repr() spells infinity and NaN as names the kernel can't see
+            if not math.isfinite(expr.value):
+                raise NotCompilable()
+            return repr(expr.value)
+        if isinstance(expr, Variable):
+            return self.variable(expr, expr.name, depth_offset)
+        if isinstance(expr, Unary) and expr.operator.type == TokenType.MINUS:
+            return f"(-{self.arithmetic(expr.right, depth_offset)})"
+        if isinstance(expr, Binary) and expr.operator.type in ARITHMETIC_OPERATORS:
+            left = self.arithmetic(expr.left, depth_offset)
+            right = self.arithmetic(expr.right, depth_offset)
+            return f"({left} {ARITHMETIC_OPERATORS[expr.operator.type]} {right})"
+        raise NotCompilable()
+
+    def condition(self, expr: Expression) -> str:
+        """Lower a loop condition, which must be a numeric comparison."""
+        if not (isinstance(expr, Binary) and expr.operator.type in COMPARISON_OPERATORS):
+            raise NotCompilable()
+        left = self.arithmetic(expr.left, 0)
+        right = self.arithmetic(expr.right, 0)
+        return f"{left} {COMPARISON_OPERATORS[expr.operator.type]} {right}"
+
+    def statement(self, stmt: Statement, depth_offset: int) -> str:
+        """Lower a loop body statement, which must assign a numeric value."""
+        if not (isinstance(stmt, ExpressionStmt) and isinstance(stmt.expression, Assign)):
+            raise NotCompilable()
+        assign = stmt.expression
+        value = self.arithmetic(assign.value, depth_offset)
+        self.float_only = self.float_only and float_valued(assign.value)
+        return f"{self.variable(assign, assign.name, depth_offset)} = {value}"
+
+    def compile(self, stmt: While) -> LoopKernel:
+        """Compile a loop into a kernel."""
+        body = stmt.body
+        if isinstance(body, Block):
+            # Locals declared in the body would need a fresh scope per iteration
+            if body.nlocals:
+                raise NotCompilable()
+            statements, depth_offset = body.statements, 1
+        else:
+            statements, depth_offset = [body], 0
+
+        condition = self.condition(stmt.condition)
+        lines = [self.statement(s, depth_offset) for s in statements]
+        args = ', '.join(self.names.values())
+        source = '\n'.join(
+            [f"def _mus_loop({args}):", f"    while {condition}:"]
+            + [f"        {line}" for line in lines or ['pass']]
+            + [f"    return ({args}{',' if self.names else ''})"]
+        )
+
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, '<mus-loop>', 'exec'), {'__builtins__': {}}, namespace)
+        function = namespace['_mus_loop']
+        float_function = numba.njit(function) if numba is not None and self.float_only else None
+        return LoopKernel(function, list(self.names), float_function)
+
+def compile_loop(stmt: While) -> Optional[LoopKernel]:
+    """Compile a purely numeric loop, or return None if it isn't one."""
+    try:
+        return LoopCompiler().compile(stmt)
+    except NotCompilable:
+        return None
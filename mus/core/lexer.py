@@ -2,11 +2,12 @@
 Lexer for the Mus Programming Language.
 """
 
-from dataclasses import dataclass
-from enum import Enum, auto
-from typing import Iterator, List, Optional
+import re
+import sys
+from enum import IntEnum, auto
+from typing import ClassVar, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-class TokenType(Enum):
+class TokenType(IntEnum):
     """Token types in the Mus language."""
     # Keywords
     CLASS = auto()
@@ -63,9 +64,10 @@ class TokenType(Enum):
     COMMENT = auto()
     EOF = auto()
 
-@dataclass(frozen=True)
-class Token:
+class Token(NamedTuple):
     """Token in the Mus language."""
+    # A named tuple rather than a frozen dataclass: one is built for every
+    # lexeme, and tuple construction is much cheaper
     type: TokenType
     lexeme: str
     literal: Optional[object]
@@ -85,10 +87,49 @@ class LexerError(Exception):
         self.column = column
         super().__init__(f"{message} at line {line}, column {column}")
 
+# Operator and delimiter lexemes, longest first so '==' wins over '='
+OPERATORS = {
+    '==': TokenType.EQUALS,
+    '=>': TokenType.ARROW,
+    '!=': TokenType.NOT_EQUALS,
+    '>=': TokenType.GREATER_EQUAL,
+    '<=': TokenType.LESS_EQUAL,
+    '(': TokenType.LEFT_PAREN,
+    ')': TokenType.RIGHT_PAREN,
+    '{': TokenType.LEFT_BRACE,
+    '}': TokenType.RIGHT_BRACE,
+    '[': TokenType.LEFT_BRACKET,
+    ']': TokenType.RIGHT_BRACKET,
+    ',': TokenType.COMMA,
+    '.': TokenType.DOT,
+    ';': TokenType.SEMICOLON,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '%': TokenType.MODULO,
+    '=': TokenType.ASSIGN,
+    '!': TokenType.NOT,
+    '>': TokenType.GREATER,
+    '<': TokenType.LESS,
+}
+
+# One pattern for every token, so the regex engine scans each token in a
+# single call instead of the lexer stepping through characters in Python.
+# A whole run of whitespace, newlines and comments is skipped in one match.
+# Comments must come before operators so '--' isn't read as two minuses.
+TOKEN_PATTERN = re.compile(
+    r"(?P<SKIP>(?:[ \t\r\n]|(?:--|//)[^\n]*)+)"
+    r"|(?P<NAME>[^\W\d]\w*)"
+    r"|(?P<NUMBER>\d+(?:\.\d+)?)"
+    r"|(?P<STRING>\"[^\"]*\")"
+    r"|(?P<OPERATOR>" + "|".join(re.escape(op) for op in OPERATORS) + ")"
+)
+
 class Lexer:
     """Lexer for the Mus language."""
     
-    KEYWORDS = {
+    KEYWORDS: ClassVar[Dict[str, TokenType]] = {
         'class': TokenType.CLASS,
         'fun': TokenType.FUN,
         'var': TokenType.VAR,
@@ -107,173 +148,79 @@ class Lexer:
         'false': TokenType.BOOLEAN,
     }
 
+    # Token type and literal for each reserved word, so a name costs one
+    # dict lookup and booleans need no further string compare
+    RESERVED_WORDS: ClassVar[Dict[str, Tuple[TokenType, Optional[bool]]]] = {
+        text: (token_type, text == 'true' if token_type is TokenType.BOOLEAN else None)
+        for text, token_type in KEYWORDS.items()
+    }
+
     def __init__(self, source: str):
         self.source = source
         self.tokens: List[Token] = []
-        self.start = 0
         self.current = 0
         self.line = 1
         self.column = 1
 
     def scan_tokens(self) -> List[Token]:
         """Scan the source code and return a list of tokens."""
-        while not self.is_at_end():
-            self.start = self.current
-            self.scan_token()
-
-        self.tokens.append(Token(TokenType.EOF, "", None, self.line, self.column))
-        return self.tokens
-
-    def scan_token(self) -> None:
-        """Scan a single token."""
-        c = self.advance()
+        source = self.source
+        tokens = self.tokens
+        # list.append already over-allocates, so binding it beats
+        # preallocating the list and writing through an index
+        add_token = tokens.append
+        match = TOKEN_PATTERN.match
+        reserved_words = self.RESERVED_WORDS
+        intern = sys.intern
+        end = len(source)
+        position = 0
+        line = 1
+        line_start = 0  # Offset of the first character on the current line
         
-        match c:
-            # Single-character tokens
-            case '(': self.add_token(TokenType.LEFT_PAREN)
-            case ')': self.add_token(TokenType.RIGHT_PAREN)
-            case '{': self.add_token(TokenType.LEFT_BRACE)
-            case '}': self.add_token(TokenType.RIGHT_BRACE)
-            case '[': self.add_token(TokenType.LEFT_BRACKET)
-            case ']': self.add_token(TokenType.RIGHT_BRACKET)
-            case ',': self.add_token(TokenType.COMMA)
-            case '.': self.add_token(TokenType.DOT)
-            case '+': self.add_token(TokenType.PLUS)
-            case '*': self.add_token(TokenType.MULTIPLY)
-            case '%': self.add_token(TokenType.MODULO)
-            case ';': self.add_token(TokenType.SEMICOLON)
-            
-            # Two-character tokens
-            case '=':
-                if self.match('='): self.add_token(TokenType.EQUALS)
-                elif self.match('>'): self.add_token(TokenType.ARROW)
-                else: self.add_token(TokenType.ASSIGN)
-            case '!':
-                if self.match('='): self.add_token(TokenType.NOT_EQUALS)
-                else: self.add_token(TokenType.NOT)
-            case '>':
-                if self.match('='): self.add_token(TokenType.GREATER_EQUAL)
-                else: self.add_token(TokenType.GREATER)
-            case '<':
-                if self.match('='): self.add_token(TokenType.LESS_EQUAL)
-                else: self.add_token(TokenType.LESS)
-            case '-':
-                if self.match('-'):
-                    # Comment goes until end of line
-                    while self.peek() != '\n' and not self.is_at_end():
-                        self.advance()
-                else:
-                    self.add_token(TokenType.MINUS)
-            case '/':
-                if self.match('/'):
-                    # Comment goes until end of line
-                    while self.peek() != '\n' and not self.is_at_end():
-                        self.advance()
-                else:
-                    self.add_token(TokenType.DIVIDE)
-            
-            # Whitespace
-            case ' ' | '\r' | '\t':
-                pass
-            case '\n':
-                self.line += 1
-                self.column = 1
+        while position < end:
+            token_match = match(source, position)
+            if token_match is None:
+                column = position - line_start + 1
+                if source[position] == '"':
+                    raise LexerError("Unterminated string", line, column)
+                raise LexerError(f"Unexpected character: {source[position]}", line, column)
             
-            # String literals
-            case '"': self.string()
+            kind = token_match.lastgroup
+            text = token_match.group()
+            column = position - line_start + 1
+            position = token_match.end()
             
-            # Default case for other characters
-            case _:
-                if c.isdigit():
-                    self.number()
-                elif c.isalpha() or c == '_':
-                    self.identifier()
+            if kind == 'SKIP':
+                # Line tracking only needs the last newline in the run
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = token_match.start() + text.rindex('\n') + 1
+            elif kind == 'NAME':
+                # Every use of a name shares one string, which keeps the
+                # tree small and lets scope lookups match on identity
+                text = intern(text)
+                reserved = reserved_words.get(text)
+                if reserved is None:
+                    add_token(Token(TokenType.IDENTIFIER, text, None, line, column))
                 else:
-                    raise LexerError(f"Unexpected character: {c}", self.line, self.column)
-
-    def identifier(self) -> None:
-        """Scan an identifier."""
-        while (c := self.peek()).isalnum() or c == '_':
-            self.advance()
-
-        text = self.source[self.start:self.current]
-        token_type = self.KEYWORDS.get(text, TokenType.IDENTIFIER)
-        literal = None
+                    add_token(Token(reserved[0], text, reserved[1], line, column))
+            elif kind == 'OPERATOR':
+                text = intern(text)
+                add_token(Token(OPERATORS[text], text, None, line, column))
+            elif kind == 'NUMBER':
+                value = float(text) if '.' in text else int(text)
+                add_token(Token(TokenType.INTEGER, text, value, line, column))
+            else:
+                add_token(Token(TokenType.STRING, text, text[1:-1], line, column))
+                # Strings may span lines
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = token_match.start() + text.rindex('\n') + 1
         
-        if token_type == TokenType.BOOLEAN:
-            literal = text == 'true'
-            
-        self.add_token(token_type, literal)
-
-    def number(self) -> None:
-        """Scan a number."""
-        while self.peek().isdigit():
-            self.advance()
-
-        # Look for a decimal part
-        if self.peek() == '.' and self.peek_next().isdigit():
-            # Consume the "."
-            self.advance()
-
-            while self.peek().isdigit():
-                self.advance()
-
-        value = int(self.source[self.start:self.current])
-        self.add_token(TokenType.INTEGER, value)
-
-    def string(self) -> None:
-        """Scan a string."""
-        while self.peek() != '"' and not self.is_at_end():
-            if self.peek() == '\n':
-                self.line += 1
-                self.column = 1
-            self.advance()
-
-        if self.is_at_end():
-            raise LexerError("Unterminated string", self.line, self.column)
-
-        # The closing "
-        self.advance()
-
-        # Trim the surrounding quotes
-        value = self.source[self.start + 1:self.current - 1]
-        self.add_token(TokenType.STRING, value)
-
-    def match(self, expected: str) -> bool:
-        """Check if the current character matches the expected one."""
-        if self.is_at_end():
-            return False
-        if self.source[self.current] != expected:
-            return False
-
-        self.current += 1
-        self.column += 1
-        return True
-
-    def peek(self) -> str:
-        """Look at the current character without consuming it."""
-        if self.is_at_end():
-            return '\0'
-        return self.source[self.current]
-
-    def peek_next(self) -> str:
-        """Look at the next character without consuming it."""
-        if self.current + 1 >= len(self.source):
-            return '\0'
-        return self.source[self.current + 1]
-
-    def is_at_end(self) -> bool:
-        """Check if we've reached the end of the source code."""
-        return self.current >= len(self.source)
-
-    def advance(self) -> str:
-        """Consume and return the current character."""
-        c = self.source[self.current]
-        self.current += 1
-        self.column += 1
-        return c
-
-    def add_token(self, type_: TokenType, literal: Optional[object] = None) -> None:
-        """Add a token to the list."""
-        text = self.source[self.start:self.current]
-        self.tokens.append(Token(type_, text, literal, self.line, self.column - len(text))) 
\ No newline at end of file
+        self.current = position
+        self.line = line
+        self.column = position - line_start + 1
+        tokens.append(Token(TokenType.EOF, "", None, self.line, self.column))
+        return tokens
@@ -0,0 +1,115 @@
+"""
+Operator implementations shared by the Mus parser and interpreter.
+"""
+
+from typing import Any, Callable, Dict
+from .lexer import Token, TokenType
+
+class InterpreterError(Exception):
+    """Exception raised for interpreter errors."""
+    def __init__(self, message: str, token: Token):
+        self.message = message
+        self.token = token
+        super().__init__(f"{message} at line {token.line}, column {token.column}")
+
+# Exact types of numeric values. Testing type(x) membership here is cheaper
+# than isinstance; bool is listed because it counts as a number too.
+NUMBER_TYPES = frozenset((int, float, bool))
+
+def binary_plus(operator: Token, left: Any, right: Any) -> Any:
+    """Add numbers or concatenate strings."""
+    if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+        return left + right
+    if type(left) is str or type(right) is str:
+        return str(left) + str(right)
+    raise InterpreterError("Operands must be numbers or strings", operator)
+
+def binary_minus(operator: Token, left: Any, right: Any) -> Any:
+    """Subtract two numbers."""
+    if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+        return left - right
+    raise InterpreterError("Operands must be numbers", operator)
+
+def binary_multiply(operator: Token, left: Any, right: Any) -> Any:
+    """Multiply two numbers."""
+    if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+        return left * right
+    raise InterpreterError("Operands must be numbers", operator)
+
+def binary_divide(operator: Token, left: Any, right: Any) -> Any:
+    """Divide two numbers."""
+    if not (type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES):
+        raise InterpreterError("Operands must be numbers", operator)
+    if right == 0:
+        raise InterpreterError("Division by zero", operator)
+    return left / right
+
+def binary_modulo(operator: Token, left: Any, right: Any) -> Any:
+    """Take the remainder of two numbers."""
+    if not (type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES):
+        raise InterpreterError("Operands must be numbers", operator)
+    if right == 0:
+        raise InterpreterError("Modulo by zero", operator)
+    return left % right
+
+def binary_greater(operator: Token, left: Any, right: Any) -> Any:
+    """Compare two numbers with >."""
+    if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+        return left > right
+    raise InterpreterError("Operands must be numbers", operator)
+
+def binary_greater_equal(operator: Token, left: Any, right: Any) -> Any:
+    """Compare two numbers with >=."""
+    if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+        return left >= right
+    raise InterpreterError("Operands must be numbers", operator)
+
+def binary_less(operator: Token, left: Any, right: Any) -> Any:
+    """Compare two numbers with <."""
+    if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+        return left < right
+    raise InterpreterError("Operands must be numbers", operator)
+
+def binary_less_equal(operator: Token, left: Any, right: Any) -> Any:
+    """Compare two numbers with <=."""
+    if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+        return left <= right
+    raise InterpreterError("Operands must be numbers", operator)
+
+def values_equal(left: Any, right: Any) -> bool:
+    """Compare two Mus values for equality."""
+    if left is right:
+        # Identity implies equality for everything except NaN
+        return type(left) is not float or left == left
+    left_type = type(left)
+    right_type = type(right)
+    if left_type is not right_type and (left_type not in NUMBER_TYPES or right_type not in NUMBER_TYPES):
+        # Only numbers compare equal across types (1 == 1.0, true == 1)
+        return False
+    # None only equals None, which == already guarantees
+    equal: bool = left == right
+    return equal
+
+def binary_equals(operator: Token, left: Any, right: Any) -> Any:
+    """Compare two values for equality."""
+    return values_equal(left, right)
+
+def binary_not_equals(operator: Token, left: Any, right: Any) -> Any:
+    """Compare two values for inequality."""
+    return not values_equal(left, right)
+
+# Binary operator implementations, attached to Binary nodes by the resolver
+# so evaluation calls the right function without looking it up.
+BINARY_OPERATORS: Dict[TokenType, Callable[[Token, Any, Any], Any]] = {
+    TokenType.PLUS: binary_plus,
+    TokenType.MINUS: binary_minus,
+    TokenType.MULTIPLY: binary_multiply,
+    TokenType.DIVIDE: binary_divide,
+    TokenType.MODULO: binary_modulo,
+    TokenType.GREATER: binary_greater,
+    TokenType.GREATER_EQUAL: binary_greater_equal,
+    TokenType.LESS: binary_less,
+    TokenType.LESS_EQUAL: binary_less_equal,
+    TokenType.EQUALS: binary_equals,
+    TokenType.NOT_EQUALS: binary_not_equals,
+}
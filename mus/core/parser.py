@@ -2,9 +2,10 @@
 Parser for the Mus Programming Language.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Union, Any
 from .lexer import Token, TokenType
+from .operators import BINARY_OPERATORS, InterpreterError
 from .types import (
     MusType, MusInt, MusString, MusBool, MusArray,
     MusFunction, MusClass, MusObject, Environment
@@ -17,83 +18,84 @@ class ParserError(Exception):
         self.token = token
         super().__init__(f"{message} at line {token.line}, column {token.column}")
 
-@dataclass(frozen=True)
+# Expression nodes compare and hash by identity, so each node in a tree is
+# distinct. Slots keep them small and let the resolver and interpreter
+# annotate them in place.
+@dataclass(eq=False, slots=True)
 class Expression:
     """Base class for expressions."""
     pass
 
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Literal(Expression):
     """Literal expression (numbers, strings, booleans)."""
-    value: Union[int, str, bool]
+    value: Any  # A number, string, boolean, None, or element expressions for arrays
     token: Token
 
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Variable(Expression):
     """Variable reference expression."""
     name: str
     token: Token
+    resolved_depth: int = field(default=-1, compare=False)  # -1 means global
+    slot: int = field(default=-1, compare=False)  # Set by the resolver
 
-    def __hash__(self) -> int:
-        return hash((self.name, self.token))
+@dataclass(eq=False, slots=True)
+class Assign(Expression):
+    """Variable assignment expression."""
+    name: str
+    value: Expression
+    token: Token
+    resolved_depth: int = field(default=-1, compare=False)  # -1 means global
+    slot: int = field(default=-1, compare=False)  # Set by the resolver
 
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class This(Expression):
     """'this' keyword expression."""
     token: Token
+    resolved_depth: int = field(default=-1, compare=False)  # -1 means global
+    slot: int = field(default=-1, compare=False)  # Set by the resolver
 
-    def __hash__(self) -> int:
-        return hash(self.token)
-
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Super(Expression):
     """'super' keyword expression."""
     method: str
     token: Token
+    resolved_depth: int = field(default=-1, compare=False)  # -1 means global
+    slot: int = field(default=-1, compare=False)  # Set by the resolver
 
-    def __hash__(self) -> int:
-        return hash((self.method, self.token))
-
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Binary(Expression):
     """Binary operation expression."""
     left: Expression
     operator: Token
     right: Expression
+    op_fn: Any = field(default=None, compare=False, repr=False)  # Set by the resolver
 
-    def __hash__(self) -> int:
-        return hash((self.left, self.operator, self.right))
-
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Unary(Expression):
     """Unary operation expression."""
     operator: Token
     right: Expression
 
-    def __hash__(self) -> int:
-        return hash((self.operator, self.right))
-
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Call(Expression):
     """Function/method call expression."""
     callee: Expression
     arguments: List[Expression]
     token: Token
 
-    def __hash__(self) -> int:
-        return hash((self.callee, tuple(self.arguments), self.token))
-
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Get(Expression):
     """Property access expression."""
     object: Expression
     name: str
     token: Token
+    # Inline cache: the method found for the last class accessed here
+    ic_class: Any = field(default=None, compare=False, repr=False)
+    ic_method: Any = field(default=None, compare=False, repr=False)
 
-    def __hash__(self) -> int:
-        return hash((self.object, self.name, self.token))
-
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Set(Expression):
     """Property assignment expression."""
     object: Expression
@@ -101,36 +103,72 @@ class Set(Expression):
     value: Expression
     token: Token
 
-    def __hash__(self) -> int:
-        return hash((self.object, self.name, self.value, self.token))
+@dataclass(eq=False, slots=True)
+class IndexGet(Expression):
+    """Array element access with a constant index, e.g. items[0]."""
+    object: Expression
+    index: int
+    token: Token
+
+@dataclass(eq=False, slots=True)
+class IndexSet(Expression):
+    """Array element assignment with a constant index, e.g. items[0] = x."""
+    object: Expression
+    index: int
+    value: Expression
+    token: Token
 
-@dataclass
+@dataclass(eq=False, slots=True)
+class Index(Expression):
+    """Array element access with a computed index, e.g. items[i]."""
+    object: Expression
+    index: Expression
+    token: Token
+
+@dataclass(eq=False, slots=True)
+class IndexAssign(Expression):
+    """Array element assignment with a computed index, e.g. items[i] = x."""
+    object: Expression
+    index: Expression
+    value: Expression
+    token: Token
+
+# Statement nodes are read on every execution, so they are slotted too
+@dataclass(slots=True)
 class Statement:
     """Base class for statements."""
     pass
 
-@dataclass
+@dataclass(slots=True)
 class ExpressionStmt(Statement):
     """Expression statement."""
     expression: Expression
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclaration(Statement):
     """Variable declaration statement."""
     name: str
     type_name: str
     initializer: Optional[Expression]
     token: Token
+    slot: int = -1  # Local slot, set by the resolver; -1 for globals
+    element_type: Optional[str] = None  # Element type of an array<T> declaration
 
-@dataclass
+    def __post_init__(self) -> None:
+        if self.type_name.startswith("array<") and self.type_name.endswith(">"):
+            self.element_type = self.type_name[6:-1]
+
+@dataclass(slots=True)
 class FunctionDeclaration(Statement):
     """Function declaration statement."""
     name: str
     params: List[tuple[str, str]]
     body: List[Statement]
     token: Token
+    nlocals: int = 0  # Parameters plus body locals, set by the resolver
+    captures_frame: bool = False  # Body declares a function or class, set by the resolver
 
-@dataclass
+@dataclass(slots=True)
 class ClassDeclaration(Statement):
     """Class declaration statement."""
     name: str
@@ -139,43 +177,86 @@ class ClassDeclaration(Statement):
     methods: List[FunctionDeclaration]
     token: Token
 
-@dataclass
+@dataclass(slots=True)
 class Block(Statement):
     """Block statement."""
     statements: List[Statement]
+    nlocals: int = 0  # Set by the resolver
 
-@dataclass
+@dataclass(slots=True)
 class If(Statement):
     """If statement."""
     condition: Expression
     then_branch: Statement
     else_branch: Optional[Statement]
 
-@dataclass
+@dataclass(slots=True)
 class While(Statement):
     """While statement."""
     condition: Expression
     body: Statement
+    # Compiled numeric kernel: None until the loop is hot, False if not compilable
+    kernel: Any = field(default=None, compare=False, repr=False)
+    hits: int = field(default=0, compare=False, repr=False)  # Iterations interpreted so far
 
-@dataclass
+@dataclass(slots=True)
 class For(Statement):
     """For statement."""
     iterator: str
     iterable: Expression
     body: Statement
 
-@dataclass
+@dataclass(slots=True)
 class Return(Statement):
     """Return statement."""
     value: Optional[Expression]
     token: Token
 
+# Binding strength of each binary operator; higher binds more tightly
+BINARY_PRECEDENCE = {
+    TokenType.EQUALS: 1,
+    TokenType.NOT_EQUALS: 1,
+    TokenType.GREATER: 2,
+    TokenType.GREATER_EQUAL: 2,
+    TokenType.LESS: 2,
+    TokenType.LESS_EQUAL: 2,
+    TokenType.PLUS: 3,
+    TokenType.MINUS: 3,
+    TokenType.MULTIPLY: 4,
+    TokenType.DIVIDE: 4,
+    TokenType.MODULO: 4,
+}
+
+# Tokens that start a statement, where parsing resumes after an error
+SYNC_TOKEN_TYPES = frozenset((
+    TokenType.CLASS,
+    TokenType.FUN,
+    TokenType.VAR,
+    TokenType.IF,
+    TokenType.WHILE,
+    TokenType.FOR,
+    TokenType.RETURN,
+))
+
 class Parser:
     """Parser for the Mus language."""
     
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.current = 0
+        
+        # Primary expression parsers, keyed by the token that starts them
+        self.primary_handlers = {
+            TokenType.IDENTIFIER: self.variable,
+            TokenType.INTEGER: self.literal,
+            TokenType.STRING: self.literal,
+            TokenType.BOOLEAN: self.literal,
+            TokenType.THIS: self.this_expression,
+            TokenType.SUPER: self.super_expression,
+            TokenType.LEFT_PAREN: self.grouping,
+            TokenType.LEFT_BRACKET: self.array_literal,
+            TokenType.NEW: self.new_expression,
+        }
 
     def parse(self) -> List[Statement]:
         """Parse the tokens into an AST."""
@@ -235,7 +316,7 @@ class Parser:
             while True:
                 param_name = self.consume(TokenType.IDENTIFIER, "Expected parameter name.").lexeme
                 self.consume(TokenType.ARROW, "Expected '=>' after parameter name.")
-                param_type = self.consume(TokenType.IDENTIFIER, "Expected parameter type.").lexeme
+                param_type = self.type_annotation("Expected parameter type.")
                 parameters.append((param_name, param_type))
                 
                 if not self.match(TokenType.COMMA):
@@ -257,13 +338,22 @@ class Parser:
         name_token = self.consume(TokenType.IDENTIFIER, "Expected variable name.")
         
         self.consume(TokenType.ARROW, "Expected '=>' after variable name.")
-        type_token = self.consume(TokenType.IDENTIFIER, "Expected variable type.")
+        type_name = self.type_annotation("Expected variable type.")
         
         initializer = None
         if self.match(TokenType.ASSIGN):
             initializer = self.expression()
         
-        return VarDeclaration(name_token.lexeme, type_token.lexeme, initializer, name_token)
+        return VarDeclaration(name_token.lexeme, type_name, initializer, name_token)
+
+    def type_annotation(self, message: str) -> str:
+        """Parse a type name such as 'integer' or 'array<integer>'."""
+        type_name = self.consume(TokenType.IDENTIFIER, message).lexeme
+        if self.match(TokenType.LESS):
+            element_type = self.type_annotation("Expected array element type.")
+            self.consume(TokenType.GREATER, "Expected '>' after array element type.")
+            type_name = f"{type_name}<{element_type}>"
+        return type_name
 
     def statement(self) -> Statement:
         """Parse a statement."""
@@ -302,7 +392,7 @@ class Parser:
         
         return While(condition, body)
 
-    def for_statement(self) -> For:
+    def for_statement(self) -> Union[For, Block]:
         """Parse a for statement."""
         self.consume(TokenType.LEFT_PAREN, "Expected '(' after 'for'.")
         
@@ -312,6 +402,12 @@ class Parser:
         else:
             iterator = self.consume(TokenType.IDENTIFIER, "Expected iterator variable name.").lexeme
         
+        # Parse a for-in loop over an array
+        if self.match(TokenType.IN):
+            iterable = self.expression()
+            self.consume(TokenType.RIGHT_PAREN, "Expected ')' after for iterable.")
+            return For(iterator, iterable, self.statement())
+        
         # Parse condition
         self.consume(TokenType.ASSIGN, "Expected '=' after iterator variable.")
         start = self.expression()
@@ -334,7 +430,9 @@ class Parser:
         # Create while loop body that includes the increment
         increment_stmt = ExpressionStmt(increment)
         if isinstance(body, Block):
-            body.statements.append(increment_stmt)
+            # Build a new block so the increment shares the body's scope
+            # without mutating the parsed body
+            body = Block(body.statements + [increment_stmt])
         else:
             body = Block([body, increment_stmt])
         
@@ -362,89 +460,99 @@ class Parser:
 
     def assignment(self) -> Expression:
         """Parse an assignment expression."""
-        expr = self.equality()
+        expr = self.binary(1)
         
         if self.match(TokenType.ASSIGN):
             equals = self.previous()
             value = self.assignment()
             
             if isinstance(expr, Variable):
-                return Set(expr, expr.name, value, equals)
+                return Assign(expr.name, value, equals)
             elif isinstance(expr, Get):
                 return Set(expr.object, expr.name, value, equals)
+            elif isinstance(expr, IndexGet):
+                return IndexSet(expr.object, expr.index, value, equals)
+            elif isinstance(expr, Index):
+                return IndexAssign(expr.object, expr.index, value, equals)
             
             raise ParserError("Invalid assignment target.", equals)
         
         return expr
 
-    def equality(self) -> Expression:
-        """Parse an equality expression."""
-        expr = self.comparison()
-        
-        while self.match(TokenType.EQUALS, TokenType.NOT_EQUALS):
-            operator = self.previous()
-            right = self.comparison()
-            expr = Binary(expr, operator, right)
-        
-        return expr
-
-    def comparison(self) -> Expression:
-        """Parse a comparison expression."""
-        expr = self.term()
-        
-        while self.match(TokenType.GREATER, TokenType.GREATER_EQUAL,
-                        TokenType.LESS, TokenType.LESS_EQUAL):
-            operator = self.previous()
-            right = self.term()
-            expr = Binary(expr, operator, right)
-        
-        return expr
-
-    def term(self) -> Expression:
-        """Parse a term expression."""
-        expr = self.factor()
-        
-        while self.match(TokenType.PLUS, TokenType.MINUS):
-            operator = self.previous()
-            right = self.factor()
-            expr = Binary(expr, operator, right)
-        
-        return expr
-
-    def factor(self) -> Expression:
-        """Parse a factor expression."""
+    def binary(self, min_precedence: int) -> Expression:
+        """Parse binary operators that bind at least as tightly as min_precedence."""
         expr = self.unary()
+        tokens = self.tokens
         
-        while self.match(TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO):
-            operator = self.previous()
-            right = self.unary()
-            expr = Binary(expr, operator, right)
-        
-        return expr
+        while True:
+            operator = tokens[self.current]
+            precedence = BINARY_PRECEDENCE.get(operator.type)
+            if precedence is None or precedence < min_precedence:
+                return expr
+            self.current += 1
+            # Operators are left-associative, so the right operand may only
+            # contain operators that bind more tightly
+            right = self.binary(precedence + 1)
+            expr = self.fold(Binary(expr, operator, right))
 
     def unary(self) -> Expression:
         """Parse a unary expression."""
-        if self.match(TokenType.NOT, TokenType.MINUS):
-            operator = self.previous()
+        operator = self.tokens[self.current]
+        if operator.type is TokenType.NOT or operator.type is TokenType.MINUS:
+            self.current += 1
             right = self.unary()
-            return Unary(operator, right)
+            return self.fold(Unary(operator, right))
         
         return self.call()
 
+    def fold(self, expr: Union[Binary, Unary]) -> Expression:
+        """Replace an operation on literal operands with its value."""
+        if isinstance(expr, Binary):
+            left, right = expr.left, expr.right
+            op_fn = BINARY_OPERATORS.get(expr.operator.type)
+            if (op_fn is None or not isinstance(left, Literal) or not isinstance(right, Literal)
+                    or isinstance(left.value, list) or isinstance(right.value, list)):
+                return expr
+            try:
+                return Literal(op_fn(expr.operator, left.value, right.value), expr.operator)
+            except InterpreterError:
+                # Leave invalid operations such as 1 / 0 to fail at runtime
+                return expr
+        
+        operand = expr.right
+        if not isinstance(operand, Literal) or isinstance(operand.value, list):
+            return expr
+        if expr.operator.type == TokenType.NOT:
+            # Only None and false are falsy
+            return Literal(operand.value is None or operand.value is False, expr.operator)
+        if expr.operator.type == TokenType.MINUS and isinstance(operand.value, (int, float)):
+            return Literal(-operand.value, expr.operator)
+        return expr
+
     def call(self) -> Expression:
         """Parse a call expression."""
         expr = self.primary()
+        tokens = self.tokens
         
         while True:
-            if self.match(TokenType.LEFT_PAREN):
+            # Read the next token once rather than trying each suffix in turn
+            token_type = tokens[self.current].type
+            if token_type is TokenType.LEFT_PAREN:
+                self.current += 1
                 expr = self.finish_call(expr)
-            elif self.match(TokenType.DOT):
+            elif token_type is TokenType.DOT:
+                self.current += 1
                 name = self.consume(TokenType.IDENTIFIER, "Expected property name after '.'.")
                 expr = Get(expr, name.lexeme, name)
-            elif self.match(TokenType.LEFT_BRACKET):
+            elif token_type is TokenType.LEFT_BRACKET:
+                self.current += 1
                 index = self.expression()
                 self.consume(TokenType.RIGHT_BRACKET, "Expected ']' after array index.")
-                expr = Get(expr, str(index), self.previous())
+                if isinstance(index, Literal) and type(index.value) is int:
+                    # Constant indices (after folding) are known at parse time
+                    expr = IndexGet(expr, index.value, self.previous())
+                else:
+                    expr = Index(expr, index, self.previous())
             else:
                 break
         
@@ -466,77 +574,91 @@ class Parser:
 
     def primary(self) -> Expression:
         """Parse a primary expression."""
-        if self.match(TokenType.INTEGER, TokenType.STRING, TokenType.BOOLEAN):
-            return Literal(self.previous().literal, self.previous())
-        
-        if self.match(TokenType.THIS):
-            return This(self.previous())
-        
-        if self.match(TokenType.SUPER):
-            token = self.previous()
-            self.consume(TokenType.DOT, "Expected '.' after 'super'.")
-            method = self.consume(TokenType.IDENTIFIER, "Expected superclass method name.")
-            return Super(method.lexeme, token)
-        
-        if self.match(TokenType.IDENTIFIER):
-            return Variable(self.previous().lexeme, self.previous())
+        # One table lookup on the current token picks the form to parse
+        token = self.tokens[self.current]
+        handler = self.primary_handlers.get(token.type)
+        if handler is None:
+            raise ParserError("Expected expression.", token)
+        self.current += 1
+        return handler(token)
+
+    def variable(self, name: Token) -> Variable:
+        """Parse a variable reference."""
+        return Variable(name.lexeme, name)
+
+    def literal(self, token: Token) -> Literal:
+        """Parse a number, string or boolean literal."""
+        return Literal(token.literal, token)
+
+    def this_expression(self, token: Token) -> This:
+        """Parse a 'this' expression."""
+        return This(token)
+
+    def super_expression(self, token: Token) -> Super:
+        """Parse a superclass method access."""
+        self.consume(TokenType.DOT, "Expected '.' after 'super'.")
+        method = self.consume(TokenType.IDENTIFIER, "Expected superclass method name.")
+        return Super(method.lexeme, token)
+
+    def grouping(self, paren: Token) -> Expression:
+        """Parse a parenthesized expression."""
+        expr = self.expression()
+        self.consume(TokenType.RIGHT_PAREN, "Expected ')' after expression.")
+        return expr
+
+    def array_literal(self, bracket: Token) -> Literal:
+        """Parse an array literal."""
+        elements = []
+        if not self.check(TokenType.RIGHT_BRACKET):
+            while True:
+                elements.append(self.expression())
+                if not self.match(TokenType.COMMA):
+                    break
         
-        if self.match(TokenType.LEFT_PAREN):
-            expr = self.expression()
-            self.consume(TokenType.RIGHT_PAREN, "Expected ')' after expression.")
-            return expr
+        self.consume(TokenType.RIGHT_BRACKET, "Expected ']' after array elements.")
+        return Literal(elements, self.previous())
+
+    def new_expression(self, token: Token) -> Call:
+        """Parse a 'new' expression."""
+        name = self.consume(TokenType.IDENTIFIER, "Expected class name after 'new'.")
+        self.consume(TokenType.LEFT_PAREN, "Expected '(' after class name.")
         
-        if self.match(TokenType.LEFT_BRACKET):
-            elements = []
-            if not self.check(TokenType.RIGHT_BRACKET):
-                while True:
-                    elements.append(self.expression())
-                    if not self.match(TokenType.COMMA):
-                        break
-            
-            self.consume(TokenType.RIGHT_BRACKET, "Expected ']' after array elements.")
-            return Literal(elements, self.previous())
+        arguments = []
+        if not self.check(TokenType.RIGHT_PAREN):
+            while True:
+                arguments.append(self.expression())
+                if not self.match(TokenType.COMMA):
+                    break
         
-        if self.match(TokenType.NEW):
-            name = self.consume(TokenType.IDENTIFIER, "Expected class name after 'new'.")
-            self.consume(TokenType.LEFT_PAREN, "Expected '(' after class name.")
-            
-            arguments = []
-            if not self.check(TokenType.RIGHT_PAREN):
-                while True:
-                    arguments.append(self.expression())
-                    if not self.match(TokenType.COMMA):
-                        break
-            
-            paren = self.consume(TokenType.RIGHT_PAREN, "Expected ')' after arguments.")
-            
-            return Call(Variable(name.lexeme, name), arguments, paren)
+        paren = self.consume(TokenType.RIGHT_PAREN, "Expected ')' after arguments.")
         
-        raise ParserError("Expected expression.", self.peek())
+        return Call(Variable(name.lexeme, name), arguments, paren)
 
     def match(self, *types: TokenType) -> bool:
         """Match the current token against the given types."""
-        for type_ in types:
-            if self.check(type_):
-                self.advance()
-                return True
+        # Read the token directly; this runs for nearly every token parsed
+        token_type = self.tokens[self.current].type
+        if token_type in types and token_type is not TokenType.EOF:
+            self.current += 1
+            return True
         return False
 
     def check(self, type_: TokenType) -> bool:
         """Check if the current token is of the given type."""
-        if self.is_at_end():
-            return False
-        return self.peek().type == type_
+        token_type = self.tokens[self.current].type
+        return token_type is type_ and token_type is not TokenType.EOF
 
     def advance(self) -> Token:
         """Advance to the next token."""
-        if not self.is_at_end():
-            self.current += 1
-        return self.previous()
+        token = self.tokens[self.current]
+        if token.type is TokenType.EOF:
+            return self.tokens[self.current - 1]
+        self.current += 1
+        return token
 
     def is_at_end(self) -> bool:
         """Check if we've reached the end of the tokens."""
-        return self.peek().type == TokenType.EOF
+        return self.tokens[self.current].type is TokenType.EOF
 
     def peek(self) -> Token:
         """Look at the current token."""
@@ -548,9 +670,11 @@ class Parser:
 
     def consume(self, type_: TokenType, message: str) -> Token:
         """Consume a token of the given type."""
-        if self.check(type_):
-            return self.advance()
-        raise ParserError(message, self.peek())
+        token = self.tokens[self.current]
+        if token.type is type_ and type_ is not TokenType.EOF:
+            self.current += 1
+            return token
+        raise ParserError(message, token)
 
     def synchronize(self) -> None:
         """Synchronize the parser after an error."""
@@ -560,15 +684,7 @@ class Parser:
             if self.previous().type == TokenType.RIGHT_BRACE:
                 return
             
-            if self.peek().type in {
-                TokenType.CLASS,
-                TokenType.FUN,
-                TokenType.VAR,
-                TokenType.IF,
-                TokenType.WHILE,
-                TokenType.FOR,
-                TokenType.RETURN,
-            }:
+            if self.peek().type in SYNC_TOKEN_TYPES:
                 return
             
             self.advance()
@@ -0,0 +1,247 @@
+"""
+Resolver for the Mus Programming Language.
+"""
+
+from typing import Any, Callable, Dict, List
+from .parser import (
+    Expression, Statement, Binary, Unary, Literal, Variable, Assign,
+    This, Super, Call, Get, Set, IndexGet, IndexSet, Index, IndexAssign,
+    ExpressionStmt, VarDeclaration,
+    FunctionDeclaration, ClassDeclaration, Block, If, While, For, Return
+)
+from .operators import BINARY_OPERATORS
+
+class Resolver:
+    """Resolves local variables to a scope distance and a slot index.
+
+    Every scope the interpreter creates at runtime (blocks, function calls,
+    bound methods, for-loop iterations) has a matching scope here. Locals
+    declared in a scope are numbered in declaration order, so the runtime
+    environment can keep them in a list and read them by index. Names that
+    are not found in any local scope are left unresolved and looked up as
+    globals.
+    """
+
+    def __init__(self, interpreter: Any):
+        self.interpreter = interpreter
+        self.scopes: List[Dict[str, int]] = []
+        self.functions: List[FunctionDeclaration] = []  # Enclosing functions, innermost last
+
+        self.statement_handlers: Dict[type, Callable[[Any], None]] = {
+            ExpressionStmt: self.resolve_expression_stmt,
+            VarDeclaration: self.resolve_var_declaration,
+            FunctionDeclaration: self.resolve_function_declaration,
+            ClassDeclaration: self.resolve_class_declaration,
+            Block: self.resolve_block,
+            If: self.resolve_if,
+            While: self.resolve_while,
+            For: self.resolve_for,
+            Return: self.resolve_return,
+        }
+        self.expression_handlers: Dict[type, Callable[[Any], None]] = {
+            Literal: self.resolve_literal,
+            Variable: self.resolve_variable,
+            Assign: self.resolve_assign,
+            This: self.resolve_this,
+            Super: self.resolve_super,
+            Binary: self.resolve_binary,
+            Unary: self.resolve_unary,
+            Call: self.resolve_call,
+            Get: self.resolve_get,
+            Set: self.resolve_set,
+            IndexGet: self.resolve_index_get,
+            IndexSet: self.resolve_index_set,
+            Index: self.resolve_index,
+            IndexAssign: self.resolve_index_assign,
+        }
+
+    def resolve(self, statements: List[Statement]) -> None:
+        """Resolve a list of statements."""
+        for statement in statements:
+            self.resolve_stmt(statement)
+
+    def resolve_stmt(self, stmt: Statement) -> None:
+        """Resolve a statement."""
+        self.statement_handlers[type(stmt)](stmt)
+
+    def resolve_expr(self, expr: Expression) -> None:
+        """Resolve an expression."""
+        self.expression_handlers[type(expr)](expr)
+
+    def begin_scope(self) -> Dict[str, int]:
+        """Open a new local scope."""
+        scope: Dict[str, int] = {}
+        self.scopes.append(scope)
+        return scope
+
+    def end_scope(self) -> int:
+        """Close the innermost scope and return its number of slots."""
+        return len(self.scopes.pop())
+
+    def declare(self, name: str) -> int:
+        """Declare a name in the innermost scope and return its slot."""
+        scope = self.scopes[-1]
+        slot = scope.get(name)
+        if slot is None:
+            slot = scope[name] = len(scope)
+        return slot
+
+    def resolve_local(self, expr: Any, name: str) -> None:
+        """Record the scope distance and slot of a local name."""
+        for depth, scope in enumerate(reversed(self.scopes)):
+            slot = scope.get(name)
+            if slot is not None:
+                self.interpreter.resolve(expr, depth)
+                expr.slot = slot
+                return
+
+    def resolve_function(self, function: FunctionDeclaration) -> None:
+        """Resolve a function body in its own scope."""
+        self.begin_scope()
+        self.functions.append(function)
+        for param_name, _ in function.params:
+            self.declare(param_name)
+        self.resolve(function.body)
+        self.functions.pop()
+        function.nlocals = self.end_scope()
+
+    def mark_captured_frame(self) -> None:
+        """Note that the enclosing function's call frame outlives the call."""
+        # Functions and classes keep the environment they are declared in,
+        # so a frame that declares one can't be reused after the call
+        if self.functions:
+            self.functions[-1].captures_frame = True
+
+    def resolve_expression_stmt(self, stmt: ExpressionStmt) -> None:
+        """Resolve an expression statement."""
+        self.resolve_expr(stmt.expression)
+
+    def resolve_var_declaration(self, stmt: VarDeclaration) -> None:
+        """Resolve a variable declaration, declaring it if local."""
+        if stmt.initializer:
+            self.resolve_expr(stmt.initializer)
+        if self.scopes:
+            stmt.slot = self.declare(stmt.name)
+
+    def resolve_function_declaration(self, stmt: FunctionDeclaration) -> None:
+        """Resolve a function declaration."""
+        self.mark_captured_frame()
+        self.resolve_function(stmt)
+
+    def resolve_class_declaration(self, stmt: ClassDeclaration) -> None:
+        """Resolve a class declaration."""
+        self.mark_captured_frame()
+        # Field initializers run in the scope the class is declared in
+        for field in stmt.fields:
+            if field.initializer:
+                self.resolve_expr(field.initializer)
+
+        for method in stmt.methods:
+            # Mirrors the environment MusFunction.bind creates
+            self.begin_scope()
+            self.declare("this")
+            if stmt.superclass:
+                self.declare("super")
+            self.resolve_function(method)
+            self.end_scope()
+
+    def resolve_block(self, stmt: Block) -> None:
+        """Resolve a block in a new scope."""
+        self.begin_scope()
+        self.resolve(stmt.statements)
+        stmt.nlocals = self.end_scope()
+
+    def resolve_if(self, stmt: If) -> None:
+        """Resolve an if statement."""
+        self.resolve_expr(stmt.condition)
+        self.resolve_stmt(stmt.then_branch)
+        if stmt.else_branch:
+            self.resolve_stmt(stmt.else_branch)
+
+    def resolve_while(self, stmt: While) -> None:
+        """Resolve a while statement."""
+        self.resolve_expr(stmt.condition)
+        self.resolve_stmt(stmt.body)
+
+    def resolve_for(self, stmt: For) -> None:
+        """Resolve a for statement."""
+        self.resolve_expr(stmt.iterable)
+        # Each iteration binds the iterator in its own scope, at slot 0
+        self.begin_scope()
+        self.declare(stmt.iterator)
+        self.resolve_stmt(stmt.body)
+        self.end_scope()
+
+    def resolve_return(self, stmt: Return) -> None:
+        """Resolve a return statement."""
+        if stmt.value:
+            self.resolve_expr(stmt.value)
+
+    def resolve_literal(self, expr: Literal) -> None:
+        """Resolve a literal."""
+        # Array literals hold their element expressions
+        if isinstance(expr.value, list):
+            for element in expr.value:
+                self.resolve_expr(element)
+
+    def resolve_variable(self, expr: Variable) -> None:
+        """Resolve a variable reference."""
+        self.resolve_local(expr, expr.name)
+
+    def resolve_assign(self, expr: Assign) -> None:
+        """Resolve a variable assignment."""
+        self.resolve_expr(expr.value)
+        self.resolve_local(expr, expr.name)
+
+    def resolve_this(self, expr: This) -> None:
+        """Resolve a 'this' reference."""
+        self.resolve_local(expr, "this")
+
+    def resolve_super(self, expr: Super) -> None:
+        """Resolve a 'super' reference."""
+        self.resolve_local(expr, "super")
+
+    def resolve_binary(self, expr: Binary) -> None:
+        """Resolve a binary operation."""
+        expr.op_fn = BINARY_OPERATORS.get(expr.operator.type)
+        self.resolve_expr(expr.left)
+        self.resolve_expr(expr.right)
+
+    def resolve_unary(self, expr: Unary) -> None:
+        """Resolve a unary operation."""
+        self.resolve_expr(expr.right)
+
+    def resolve_call(self, expr: Call) -> None:
+        """Resolve a call expression."""
+        self.resolve_expr(expr.callee)
+        for argument in expr.arguments:
+            self.resolve_expr(argument)
+
+    def resolve_get(self, expr: Get) -> None:
+        """Resolve a property access."""
+        self.resolve_expr(expr.object)
+
+    def resolve_set(self, expr: Set) -> None:
+        """Resolve a property assignment."""
+        self.resolve_expr(expr.value)
+        self.resolve_expr(expr.object)
+
+    def resolve_index_get(self, expr: IndexGet) -> None:
+        """Resolve an array access."""
+        self.resolve_expr(expr.object)
+
+    def resolve_index_set(self, expr: IndexSet) -> None:
+        """Resolve an array assignment."""
+        self.resolve_expr(expr.value)
+        self.resolve_expr(expr.object)
+
+    def resolve_index(self, expr: Index) -> None:
+        """Resolve an array access with a computed index."""
+        self.resolve_expr(expr.object)
+        self.resolve_expr(expr.index)
+
+    def resolve_index_assign(self, expr: IndexAssign) -> None:
+        """Resolve an array assignment with a computed index."""
+        self.resolve_expr(expr.value)
+        self.resolve_expr(expr.object)
+        self.resolve_expr(expr.index)
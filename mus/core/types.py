@@ -3,17 +3,20 @@ Core types for the Mus Programming Language.
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union, TypeVar, Generic
 from typing_extensions import Protocol
 
 # Type variables for generics
 T = TypeVar('T')
 
+# Marks a missing dict entry where None is a valid value
+_MISS = object()
+
 class MusType(Protocol):
     """Base protocol for all Mus types."""
     def __str__(self) -> str: ...
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MusInt:
     """Integer type in Mus."""
     value: int
@@ -21,7 +24,7 @@ class MusInt:
     def __str__(self) -> str:
         return str(self.value)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MusString:
     """String type in Mus."""
     value: str
@@ -29,7 +32,7 @@ class MusString:
     def __str__(self) -> str:
         return self.value
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MusBool:
     """Boolean type in Mus."""
     value: bool
@@ -37,73 +40,120 @@ class MusBool:
     def __str__(self) -> str:
         return str(self.value).lower()
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MusArray(Generic[T]):
     """Array type in Mus."""
     elements: List[T]
     element_type: str
 
+    @classmethod
+    def create(cls, values: List[T], element_type: str) -> 'MusArray[T]':
+        """Create an array holding a copy of the given values."""
+        return cls(list(values), element_type)
+
     def __str__(self) -> str:
         return f"[{', '.join(str(e) for e in self.elements)}]"
     
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.elements)
+    
     def get(self, index: int) -> T:
         """Get an element by index."""
         if not isinstance(index, int):
             raise TypeError(f"Array index must be an integer, got {type(index)}")
-        if index < 0 or index >= len(self.elements):
-            raise IndexError(f"Array index {index} out of bounds")
-        return self.elements[index]
+        # Indexing checks the upper bound itself; negative indices would
+        # count from the end, so they are rejected here
+        if index >= 0:
+            try:
+                return self.elements[index]
+            except IndexError:
+                pass
+        raise IndexError(f"Array index {index} out of bounds")
     
     def set(self, index: int, value: T) -> None:
         """Set an element by index."""
         if not isinstance(index, int):
             raise TypeError(f"Array index must be an integer, got {type(index)}")
-        if index < 0 or index >= len(self.elements):
-            raise IndexError(f"Array index {index} out of bounds")
-        self.elements[index] = value
+        if index >= 0:
+            try:
+                self.elements[index] = value
+                return
+            except IndexError:
+                pass
+        raise IndexError(f"Array index {index} out of bounds")
     
     def length(self) -> int:
         """Get the length of the array."""
         return len(self.elements)
 
-@dataclass
+@dataclass(slots=True)
 class Environment:
     """Environment for variable, function, and class scoping."""
     parent: Optional['Environment'] = None
-    variables: Dict[str, tuple[str, Any]] = field(default_factory=dict)
+    # Declared types and current values are kept apart so that assigning
+    # a variable stores the value alone instead of a new (type, value) tuple
+    var_types: Dict[str, Optional[str]] = field(default_factory=dict)
+    var_values: Dict[str, Any] = field(default_factory=dict)
     functions: Dict[str, 'MusFunction'] = field(default_factory=dict)
     classes: Dict[str, 'MusClass'] = field(default_factory=dict)
+    values: List[Any] = field(default_factory=list)  # Resolved locals, by slot
 
-    def define_variable(self, name: str, type_name: str, value: Any) -> None:
+    def define_variable(self, name: str, type_name: Optional[str], value: Any) -> None:
         """Define a new variable in the current environment."""
-        self.variables[name] = (type_name, value)
+        self.var_types[name] = type_name
+        self.var_values[name] = value
 
     def get_variable(self, name: str) -> Optional[Any]:
         """Get a variable from the current or parent environment."""
-        if name in self.variables:
-            return self.variables[name][1]
-        if self.parent:
-            return self.parent.get_variable(name)
+        # Walk the chain in a loop rather than one Python call per scope
+        environment: Optional[Environment] = self
+        while environment is not None:
+            var_values = environment.var_values
+            value = var_values.get(name)
+            if value is not None or name in var_values:
+                return value
+            environment = environment.parent
         return None
 
     def set_variable(self, name: str, value: Any) -> None:
         """Set the value of an existing variable."""
-        if name in self.variables:
-            type_name = self.variables[name][0]
-            self.variables[name] = (type_name, value)
-        elif self.parent:
-            self.parent.set_variable(name, value)
-        else:
-            raise NameError(f"Variable '{name}' not defined")
-
-    def get_at(self, distance: int, name: str) -> Any:
-        """Get a variable at a specific scope distance."""
-        environment = self
-        for _ in range(distance):
-            if environment.parent is None:
-                raise RuntimeError(f"Invalid scope distance for variable '{name}'")
+        environment: Optional[Environment] = self
+        while environment is not None:
+            var_values = environment.var_values
+            if name in var_values:
+                var_values[name] = value
+                return
             environment = environment.parent
-        return environment.get_variable(name)
+        raise NameError(f"Variable '{name}' not defined")
+
+    def ancestor(self, distance: int) -> 'Environment':
+        """Get the environment a specific scope distance away."""
+        environment: Optional[Environment] = self
+        while distance and environment is not None:
+            environment = environment.parent
+            distance -= 1
+        if environment is None:
+            raise RuntimeError("Invalid scope distance")
+        return environment
+
+    def get_at(self, distance: int, slot: int) -> Any:
+        """Get a resolved local at a specific scope distance."""
+        # Most locals live in the current scope or the one just outside it
+        if distance == 0:
+            return self.values[slot]
+        parent = self.parent
+        if distance == 1 and parent is not None:
+            return parent.values[slot]
+        return self.ancestor(distance).values[slot]
+
+    def assign_at(self, distance: int, slot: int, value: Any) -> None:
+        """Set a resolved local at a specific scope distance."""
+        if distance == 0:
+            self.values[slot] = value
+        elif distance == 1 and self.parent is not None:
+            self.parent.values[slot] = value
+        else:
+            self.ancestor(distance).values[slot] = value
 
     def define_function(self, name: str, params: List[tuple[str, str]], body: List[Any]) -> None:
         """Define a function in the current environment."""
@@ -111,10 +161,12 @@ class Environment:
 
     def get_function(self, name: str) -> Optional['MusFunction']:
         """Get a function from the current or parent environment."""
-        if name in self.functions:
-            return self.functions[name]
-        if self.parent:
-            return self.parent.get_function(name)
+        environment: Optional[Environment] = self
+        while environment is not None:
+            function = environment.functions.get(name)
+            if function is not None:
+                return function
+            environment = environment.parent
         return None
 
     def define_class(self, name: str, fields: Dict[str, tuple[str, Any]], methods: Dict[str, 'MusFunction'], parent: Optional['MusClass'] = None) -> 'MusClass':
@@ -125,20 +177,27 @@ class Environment:
 
     def get_class(self, name: str) -> Optional['MusClass']:
         """Get a class from the current or parent environment."""
-        if name in self.classes:
-            return self.classes[name]
-        if self.parent:
-            return self.parent.get_class(name)
+        environment: Optional[Environment] = self
+        while environment is not None:
+            class_def = environment.classes.get(name)
+            if class_def is not None:
+                return class_def
+            environment = environment.parent
         return None
 
-@dataclass
+@dataclass(slots=True)
 class MusFunction:
     """Function type in Mus."""
     name: str
     params: List[tuple[str, str]]  # [(param_name, param_type), ...]
     body: List[Any]  # List of statements
     closure: Optional[Environment] = None
-    native_fn: Optional[callable] = None  # For built-in functions
+    native_fn: Optional[Callable[[List[Any]], Any]] = None  # For built-in functions
+    is_pure: bool = False  # Result depends only on the arguments
+    nlocals: int = 0  # Slots needed by a call frame, set by the resolver
+    captures_frame: bool = True  # Call frames may outlive the call
+    owner: Optional['MusClass'] = None  # Class declaring this method, if any
+    call_cache: Dict[tuple, Any] = field(default_factory=dict, compare=False, repr=False)
 
     def __str__(self) -> str:
         params_str = ', '.join(f"{name} => {type_}" for name, type_ in self.params)
@@ -146,14 +205,19 @@ class MusFunction:
 
     def bind(self, instance: 'MusObject') -> 'MusFunction':
         """Bind this function to an instance, creating a method."""
-        environment = Environment(self.closure)
-        environment.define_variable("this", instance.class_def.name, instance)
-        if instance.class_def.parent:
-            environment.define_variable("super", instance.class_def.parent.name, instance.class_def.parent)
-        bound_function = MusFunction(self.name, self.params, self.body, environment)
+        # 'this' and 'super' live in slots 0 and 1, as laid out by the resolver.
+        # 'super' is the parent of the declaring class, not of the instance's
+        # class, so an inherited method doesn't find itself again.
+        environment = Environment(self.closure, values=[instance])
+        owner = self.owner
+        if owner is not None and owner.parent:
+            environment.values.append(owner.parent)
+        bound_function = MusFunction(self.name, self.params, self.body, environment,
+                                     nlocals=self.nlocals, captures_frame=self.captures_frame,
+                                     owner=owner)
         return bound_function
 
-@dataclass
+@dataclass(slots=True)
 class MusClass:
     """Class type in Mus."""
     name: str
@@ -161,25 +225,37 @@ class MusClass:
     methods: Dict[str, MusFunction]
     parent: Optional['MusClass'] = None
     environment: Optional[Environment] = None
+    # Fields and methods of this class and its ancestors, merged once so
+    # lookups don't walk the inheritance chain. Overrides replace the
+    # parent's entries, and classes don't change after declaration.
+    all_fields: Dict[str, tuple[str, Any]] = field(init=False, repr=False, compare=False)
+    all_methods: Dict[str, MusFunction] = field(init=False, repr=False, compare=False)
+    # The two halves of all_fields, split once so creating an instance or
+    # writing a field doesn't unpack the tuples
+    field_types: Dict[str, str] = field(init=False, repr=False, compare=False)
+    field_defaults: Dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.parent:
+            self.all_fields = {**self.parent.all_fields, **self.fields}
+            self.all_methods = {**self.parent.all_methods, **self.methods}
+        else:
+            self.all_fields = dict(self.fields)
+            self.all_methods = dict(self.methods)
+        self.field_types = {name: type_name for name, (type_name, _) in self.all_fields.items()}
+        self.field_defaults = {name: default for name, (_, default) in self.all_fields.items()}
 
     def __str__(self) -> str:
         return f"class {self.name}"
 
     def get_method(self, name: str) -> Optional[MusFunction]:
         """Get a method by name, looking up the inheritance chain if necessary."""
-        if name in self.methods:
-            return self.methods[name]
-        if self.parent:
-            return self.parent.get_method(name)
-        return None
+        return self.all_methods.get(name)
 
     def create_instance(self, interpreter: Any) -> 'MusObject':
         """Create a new instance of this class."""
-        instance = MusObject(self)
-        
-        # Initialize fields with default values
-        for name, (type_name, default_value) in self.fields.items():
-            instance.fields[name] = default_value
+        # Initialize fields, inherited ones included, with default values
+        instance = MusObject(self, dict(self.field_defaults))
 
         # Create instance environment
         instance.environment = Environment(self.environment)
@@ -195,41 +271,46 @@ class MusClass:
 
         return instance
 
-@dataclass
+@dataclass(slots=True)
 class MusObject:
     """Instance of a class in Mus."""
     class_def: MusClass
     fields: Dict[str, Any] = field(default_factory=dict)
     environment: Optional[Environment] = None
+    bound_methods: Dict[str, MusFunction] = field(default_factory=dict, compare=False, repr=False)
 
     def __str__(self) -> str:
         return f"{self.class_def.name}@{id(self)}"
 
+    def bind_method(self, name: str, method: MusFunction) -> MusFunction:
+        """Return the method bound to this instance, binding it on first use."""
+        # A bound method's environment only holds 'this' and 'super', which
+        # never change, so one bound copy serves every call on this instance
+        bound = self.bound_methods.get(name)
+        if bound is None:
+            bound = self.bound_methods[name] = method.bind(self)
+        return bound
+
     def get_field(self, name: str) -> Any:
         """Get a field value by name."""
-        if name in self.fields:
-            return self.fields[name]
+        value = self.fields.get(name, _MISS)
+        if value is not _MISS:
+            return value
         
-        # Look for method
+        # Look for method; get_method already searches the parent classes
         method = self.class_def.get_method(name)
         if method:
-            return method.bind(self)
-            
-        if self.class_def.parent:
-            parent_obj = MusObject(self.class_def.parent)
-            return parent_obj.get_field(name)
+            return self.bind_method(name, method)
             
         raise NameError(f"Field '{name}' not found in class '{self.class_def.name}'")
 
     def set_field(self, name: str, value: Any) -> None:
         """Set a field value by name."""
-        if name in self.class_def.fields or name in self.fields:
+        # field_types covers inherited fields as well as this class's own
+        field_types = self.class_def.field_types
+        if name in field_types or name in self.fields:
             self.fields[name] = value
             if self.environment:
-                self.environment.define_variable(name, self.class_def.fields.get(name, (None, None))[0], value)
-        elif self.class_def.parent:
-            parent_obj = MusObject(self.class_def.parent)
-            parent_obj.set_field(name, value)
-            self.fields[name] = value  # Cache the value in this instance
+                self.environment.define_variable(name, field_types.get(name), value)
         else:
             raise NameError(f"Field '{name}' not found in class '{self.class_def.name}'") 
\ No newline at end of file
@@ -2,6 +2,8 @@
 Custom exceptions for the Mus Programming Language.
 """
 
+import sys
+from typing import Optional, TextIO
 from colorama import init, Fore, Style
 
 # Initialize colorama
@@ -15,46 +17,63 @@ class Colors:
     RESET = Style.RESET_ALL
     BOLD = Style.BRIGHT
 
-def format_error(message: str, line_number: int = None, error_type: str = "Error") -> str:
+def format_error(message: str, line_number: Optional[int] = None, error_type: str = "Error",
+                 stream: Optional[TextIO] = None) -> str:
     """Format an error message with colors and line number."""
-    error_prefix = f"{Colors.ERROR}{Colors.BOLD}{error_type}:{Colors.RESET} "
+    # Only colour output going to a terminal; piped output stays plain.
+    # Errors are reported on stderr unless the caller writes them elsewhere.
+    if stream is None:
+        stream = sys.stderr
+    if stream.isatty():
+        error_prefix = f"{Colors.ERROR}{Colors.BOLD}{error_type}:{Colors.RESET} "
+    else:
+        error_prefix = f"{error_type}: "
     if line_number:
         return f"{error_prefix}{message} (line {line_number})"
     return f"{error_prefix}{message}"
 
 class MusError(Exception):
-    """Base class for all Mus language errors."""
-    def __init__(self, message: str, line_number: int):
-        self.message = message
+    """Base class for all Mus language errors.
+    
+    Formatting is deferred until the message is read, so errors that are
+    raised and caught internally never build the coloured text.
+    """
+    error_type: Optional[str] = None  # Label used to format the message, set by subclasses
+    
+    def __init__(self, message: str, line_number: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.raw_message = message
         self.line_number = line_number
-        super().__init__(f"Mus Error: {message} (line {line_number})")
+    
+    @property
+    def message(self) -> str:
+        """The formatted error message."""
+        if self.error_type is None:
+            return self.raw_message
+        return format_error(self.raw_message, self.line_number, self.error_type)
+    
+    def __str__(self) -> str:
+        return f"Mus Error: {self.message} (line {self.line_number})"
 
 class ParserError(MusError):
     """Raised when there is a syntax error in the Mus code."""
-    def __init__(self, message: str, line_number: int = None):
-        self.message = format_error(message, line_number, "Syntax Error")
-        super().__init__(self.message, line_number)
+    error_type = "Syntax Error"
 
 class TypeError(MusError):
     """Raised when there is a type mismatch in the Mus code."""
-    def __init__(self, message: str, line_number: int = None):
-        self.message = format_error(message, line_number, "Type Error")
-        super().__init__(self.message, line_number)
+    error_type = "Type Error"
 
 class RuntimeError(MusError):
     """Raised when there is a runtime error in the Mus code."""
-    def __init__(self, message: str, line_number: int = None):
-        self.message = format_error(message, line_number, "Runtime Error")
-        super().__init__(self.message, line_number)
+    error_type = "Runtime Error"
 
 class NameError(MusError):
     """Raised when a variable, function, or class is not found."""
-    def __init__(self, message: str, line_number: int = None):
-        self.message = format_error(message, line_number, "Name Error")
-        super().__init__(self.message, line_number)
+    error_type = "Name Error"
 
 class KeyboardInterruptError(MusError):
     """Exception raised when the program is interrupted by the user."""
-    def __init__(self):
-        self.message = format_error("Program interrupted by user", None, "Interrupt Error")
-        super().__init__(self.message) 
\ No newline at end of file
+    error_type = "Interrupt Error"
+    
+    def __init__(self) -> None:
+        super().__init__("Program interrupted by user")
@@ -3,22 +3,87 @@ Lexer for the Mus language.
 """
 
 import re
+import sys
+from array import array
 from typing import List, Iterator
 from .tokens import Token, TokenType
 from .exceptions import ParserError
 
+# One alternation for every token, in the order the lexer tries them, so the
+# regex engine finds each token in a single call instead of the lexer
+# stepping through the source one character at a time
+TOKEN_PATTERN = re.compile(
+    r'(?P<WHITESPACE>\s+)'
+    r'|(?P<COMMENT>--[^\n]*)'
+    r'|(?P<IDENTIFIER>[^\W\d]\w*)'
+    r'|(?P<NUMBER>\d+)'
+    r'|(?P<STRING>"(?P<BODY>(?:[^"\\]|\\[\s\S]?)*)"?)'
+    r'|(?P<OPERATOR>==|!=|<=|>=|=>|[-+*/%=<>!.])'
+    r'|(?P<SEPARATOR>[(){}\[\],;])'
+    r'|(?P<INVALID>[\s\S])'
+)
+
+# Known escapes stay escaped in the token value; any other escape is dropped
+STRING_ESCAPE = re.compile(r'\\([\s\S]?)')
+ESCAPE_CHARACTERS = {'"', 'n', 't', '\\'}
+
+def _keep_escape(match: 're.Match[str]') -> str:
+    """Return the token text for one escape sequence in a string."""
+    character = match.group(1)
+    return '\\' + character if character in ESCAPE_CHARACTERS else ''
+
+# Token type for each enum value, to rebuild Token objects from a stream
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+class TokenStream:
+    """Tokens stored as parallel arrays, indexed by token number."""
+    
+    def __init__(self) -> None:
+        self.types = array('b')  # TokenType values
+        self.values: List[str] = []
+        self.lines = array('i')
+    
+    def __len__(self) -> int:
+        """Return the number of tokens."""
+        return len(self.values)
+    
+    def kind(self, index: int) -> int:
+        """Return the TokenType value of a token."""
+        return self.types[index]
+    
+    def text(self, index: int) -> str:
+        """Return the text of a token."""
+        return self.values[index]
+    
+    def line(self, index: int) -> int:
+        """Return the line a token starts on."""
+        return self.lines[index]
+    
+    def to_tokens(self) -> List[Token]:
+        """Build a Token object for every token in the stream."""
+        return list(map(Token, map(TOKEN_TYPES.__getitem__, self.types), self.values, self.lines))
+
 class Lexer:
     """Lexer for tokenizing Mus source code."""
     
-    KEYWORDS = {
+    KEYWORDS = frozenset(map(sys.intern, {
         'var', 'fun', 'if', 'else', 'elif', 'while', 'for', 'in', 'return',
         'class', 'extends', 'new', 'this', 'out', 'import', 'from', 'export'
-    }
+    }))
     
-    TYPES = {
+    TYPES = frozenset(map(sys.intern, {
         'string', 'integer', 'bool', 'array'
+    }))
+    
+    # Token type of each reserved word, so a name is classified with one lookup
+    WORD_TYPES = {
+        **{word: TokenType.KEYWORD for word in KEYWORDS},
+        **{word: TokenType.TYPE for word in TYPES},
     }
     
+    # The same, as TokenType values for a TokenStream
+    WORD_TYPE_VALUES = {word: token_type.value for word, token_type in WORD_TYPES.items()}
+    
     OPERATORS = {
         '+', '-', '*', '/', '%', '=', '==', '!=', '<', '>', '<=', '>=',
         '&&', '||', '!', '.', '=>'
@@ -26,121 +91,90 @@ class Lexer:
     
     def __init__(self, source: str):
         self.source = source
-        self.position = 0
         self.line = 1
-        self.current_char = self.source[0] if source else None
-    
-    def advance(self):
-        """Move to the next character."""
-        self.position += 1
-        if self.position < len(self.source):
-            self.current_char = self.source[self.position]
-        else:
-            self.current_char = None
     
-    def skip_whitespace(self):
-        """Skip whitespace characters."""
-        while self.current_char and self.current_char.isspace():
-            if self.current_char == '\n':
-                self.line += 1
-            self.advance()
-    
-    def skip_comment(self):
-        """Skip comment characters."""
-        while self.current_char and self.current_char != '\n':
-            self.advance()
-    
-    def identifier(self) -> Token:
-        """Process an identifier or keyword."""
-        result = ''
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            result += self.current_char
-            self.advance()
+    def tokenize(self) -> List[Token]:
+        """Tokenize the entire source code."""
+        # Built directly rather than through scan(), which would store every
+        # token twice on the way to a Token list
+        tokens: List[Token] = []
+        add_token = tokens.append
+        word_types = self.WORD_TYPES
+        intern = sys.intern
+        identifier = TokenType.IDENTIFIER
+        line = 1
         
-        if result in self.KEYWORDS:
-            return Token(TokenType.KEYWORD, result, self.line)
-        elif result in self.TYPES:
-            return Token(TokenType.TYPE, result, self.line)
-        else:
-            return Token(TokenType.IDENTIFIER, result, self.line)
-    
-    def number(self) -> Token:
-        """Process a number."""
-        result = ''
-        while self.current_char and self.current_char.isdigit():
-            result += self.current_char
-            self.advance()
-        return Token(TokenType.NUMBER, result, self.line)
-    
-    def string(self) -> Token:
-        """Process a string literal."""
-        result = ''
-        self.advance()  # Skip opening quote
-        while self.current_char and self.current_char != '"':
-            if self.current_char == '\\':
-                self.advance()
-                if self.current_char in {'"', 'n', 't', '\\'}:
-                    result += '\\' + self.current_char
-            else:
-                result += self.current_char
-            self.advance()
-        self.advance()  # Skip closing quote
-        return Token(TokenType.STRING, result, self.line)
-    
-    def operator(self) -> Token:
-        """Process an operator."""
-        result = self.current_char
-        self.advance()
-        if self.current_char and result + self.current_char in self.OPERATORS:
-            result += self.current_char
-            self.advance()
-        return Token(TokenType.OPERATOR, result, self.line)
+        for match in TOKEN_PATTERN.finditer(self.source):
+            kind = match.lastgroup
+            if kind == 'WHITESPACE':
+                line += match.group().count('\n')
+            elif kind == 'IDENTIFIER':
+                # Every use of a name shares one string, so later dict
+                # lookups on it compare by identity
+                text = intern(match.group())
+                add_token(Token(word_types.get(text, identifier), text, line))
+            elif kind == 'NUMBER':
+                add_token(Token(TokenType.NUMBER, match.group(), line))
+            elif kind == 'STRING':
+                value = match.group('BODY')
+                if '\\' in value:
+                    value = STRING_ESCAPE.sub(_keep_escape, value)
+                add_token(Token(TokenType.STRING, value, line))
+            elif kind == 'OPERATOR':
+                add_token(Token(TokenType.OPERATOR, match.group(), line))
+            elif kind == 'SEPARATOR':
+                add_token(Token(TokenType.SEPARATOR, match.group(), line))
+            elif kind == 'INVALID':
+                self.line = line
+                raise ParserError(f"Invalid character: {match.group()}", line)
+        
+        self.line = line
+        return tokens
     
-    def get_next_token(self) -> Token:
-        """Get the next token from the source code."""
-        while self.current_char:
-            if self.current_char.isspace():
-                self.skip_whitespace()
+    def scan(self) -> TokenStream:
+        """Tokenize the entire source code into a token stream."""
+        stream = TokenStream()
+        add_type = stream.types.append
+        add_value = stream.values.append
+        add_line = stream.lines.append
+        word_types = self.WORD_TYPE_VALUES
+        intern = sys.intern
+        identifier = TokenType.IDENTIFIER.value
+        string = TokenType.STRING.value
+        group_types = {
+            'NUMBER': TokenType.NUMBER.value,
+            'OPERATOR': TokenType.OPERATOR.value,
+            'SEPARATOR': TokenType.SEPARATOR.value,
+        }
+        line = 1
+        
+        for match in TOKEN_PATTERN.finditer(self.source):
+            kind = match.lastgroup
+            if kind == 'WHITESPACE':
+                line += match.group().count('\n')
                 continue
-            
-            if self.current_char == '-' and self.peek() == '-':
-                self.skip_comment()
+            if kind == 'COMMENT':
                 continue
-            
-            if self.current_char.isalpha() or self.current_char == '_':
-                return self.identifier()
-            
-            if self.current_char.isdigit():
-                return self.number()
-            
-            if self.current_char == '"':
-                return self.string()
-            
-            if self.current_char in self.OPERATORS:
-                return self.operator()
-            
-            if self.current_char in {'(', ')', '{', '}', '[', ']', ',', ';'}:
-                token = Token(TokenType.SEPARATOR, self.current_char, self.line)
-                self.advance()
-                return token
-            
-            raise ParserError(f"Invalid character: {self.current_char}", self.line)
+            if kind == 'IDENTIFIER':
+                # Every use of a name shares one string, so later dict
+                # lookups on it compare by identity
+                text = intern(match.group())
+                add_type(word_types.get(text, identifier))
+            elif kind == 'STRING':
+                text = match.group('BODY')
+                if '\\' in text:
+                    text = STRING_ESCAPE.sub(_keep_escape, text)
+                add_type(string)
+            elif kind == 'INVALID':
+                self.line = line
+                raise ParserError(f"Invalid character: {match.group()}", line)
+            else:
+                # Every alternative is a named group, so one always matched
+                assert kind is not None
+                text = match.group()
+                add_type(group_types[kind])
+            add_value(text)
+            add_line(line)
         
-        return Token(TokenType.UNKNOWN, '', self.line)
-    
-    def peek(self) -> str:
-        """Look at the next character without consuming it."""
-        peek_pos = self.position + 1
-        if peek_pos < len(self.source):
-            return self.source[peek_pos]
-        return None
-    
-    def tokenize(self) -> List[Token]:
-        """Tokenize the entire source code."""
-        tokens = []
-        while True:
-            token = self.get_next_token()
-            if token.type == TokenType.UNKNOWN:
-                break
-            tokens.append(token)
-        return tokens 
\ No newline at end of file
+        self.line = line
+        return stream
@@ -1,9 +1,26 @@
+import os
 from setuptools import setup, find_packages
 
+# Set MUS_USE_MYPYC=1 to compile the lexer, parser, resolver, operators and
+# interpreter to C extensions with mypyc. The pure Python modules are used
+# otherwise.
+ext_modules = []
+if os.environ.get('MUS_USE_MYPYC') == '1':
+    from mypyc.build import mypycify
+    ext_modules = mypycify([
+        '--follow-imports=silent',
+        'mus/core/lexer.py',
+        'mus/core/parser.py',
+        'mus/core/resolver.py',
+        'mus/core/operators.py',
+        'mus/core/interpreter.py',
+    ])
+
 setup(
     name='mus-language',
     version='1.0.0',
     packages=find_packages(),
+    ext_modules=ext_modules,
     install_requires=[
         'colorama>=0.4.6',
     ],
@@ -0,0 +1,17 @@
+"""
+Helpers for running Mus programs in tests.
+"""
+
+import io
+from contextlib import redirect_stdout
+from typing import List
+
+from mus import Mus
+
+def run_program(source: str) -> List[str]:
+    """Run a Mus program in a fresh interpreter and return its output lines."""
+    # Programs and error reports both write to stdout
+    output = io.StringIO()
+    with redirect_stdout(output):
+        Mus(debug=False).run(source)
+    return output.getvalue().splitlines()
@@ -0,0 +1,74 @@
+"""
+Tests for Mus arrays.
+"""
+
+import unittest
+
+from tests.support import run_program
+
+class TypedArrayTest(unittest.TestCase):
+    """Typed array declarations read and write their elements."""
+
+    def test_float_array_reads_and_writes(self) -> None:
+        """Floats round-trip, and a stored integer keeps its exact value."""
+        output = run_program("""var a => array<float> = [0.5, 2.25]
+out(a[1])
+a[0] = 9007199254740993
+out(a[0])
+out(a)
+""")
+        self.assertEqual(output, ["2.25", "9007199254740993", "[9007199254740993, 2.25]"])
+
+    def test_integer_array_keeps_large_values(self) -> None:
+        """Integers beyond 64 bits are stored and computed with exactly."""
+        output = run_program("""var b => array<integer> = [1, 1180591620717411303424]
+b[0] = b[1] * 2
+out(b[0])
+out(length(b))
+""")
+        self.assertEqual(output, [str(2 ** 71), "2"])
+
+    def test_string_array_reads_and_writes(self) -> None:
+        """Elements of a string array can be read, combined and stored."""
+        output = run_program("""var s => array<string> = ["x", "y"]
+s[0] = s[1] + "z"
+out(s)
+""")
+        self.assertEqual(output, ["[yz, y]"])
+
+    def test_out_of_bounds_is_reported(self) -> None:
+        """Reading past the end of a typed array is a runtime error."""
+        output = run_program("var a => array<integer> = [1, 2]\nout(a[2])")
+        self.assertEqual(len(output), 1)
+        self.assertIn("Array index 2 out of bounds", output[0])
+
+class UntypedArrayTest(unittest.TestCase):
+    """Array literals in 'any' variables index like typed arrays."""
+
+    def test_index_reads_and_writes(self) -> None:
+        """Constant and computed indices both read and write the literal."""
+        output = run_program("""var a => any = [1, 2, 3]
+out(a[0])
+a[1] = 5
+var i => integer = 2
+a[i] = a[i] + 4
+out(a[i])
+for (x in a) {
+  out(x)
+}
+""")
+        self.assertEqual(output, ["1", "7", "1", "5", "7"])
+
+    def test_out_of_bounds_is_reported(self) -> None:
+        """Bounds errors on untyped arrays match typed ones."""
+        output = run_program("var a => any = [1]\nout(a[1])")
+        self.assertEqual(len(output), 1)
+        self.assertIn("Array index 1 out of bounds", output[0])
+
+    def test_non_arrays_still_rejected(self) -> None:
+        """Indexing a value that isn't an array is still an error."""
+        output = run_program("var a => any = 5\nout(a[0])")
+        self.assertIn("Only arrays can be indexed", output[0])
+
+if __name__ == '__main__':
+    unittest.main()
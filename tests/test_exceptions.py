@@ -0,0 +1,46 @@
+"""
+Tests for Mus error messages.
+"""
+
+import io
+import unittest
+from unittest import mock
+
+from mus.exceptions import Colors, TypeError, format_error
+
+class TerminalStream(io.StringIO):
+    """A text stream that reports itself as a terminal."""
+
+    def isatty(self) -> bool:
+        """Claim to be a terminal."""
+        return True
+
+class ErrorColourTest(unittest.TestCase):
+    """Errors are coloured only when the stream they go to is a terminal."""
+
+    def test_plain_when_stderr_is_redirected(self) -> None:
+        """Redirected stderr gets plain text even if stdout is a terminal."""
+        with mock.patch('sys.stdout', TerminalStream()), mock.patch('sys.stderr', io.StringIO()):
+            self.assertEqual(TypeError("bad value", 3).message, "Type Error: bad value (line 3)")
+
+    def test_coloured_when_stderr_is_a_terminal(self) -> None:
+        """A terminal on stderr gets the coloured prefix."""
+        with mock.patch('sys.stdout', io.StringIO()), mock.patch('sys.stderr', TerminalStream()):
+            self.assertTrue(TypeError("bad value", 3).message.startswith(Colors.ERROR))
+
+    def test_explicit_stream(self) -> None:
+        """Callers writing elsewhere can name the stream to check."""
+        with mock.patch('sys.stderr', TerminalStream()):
+            self.assertEqual(format_error("oops", stream=io.StringIO()), "Error: oops")
+
+class ErrorArgsTest(unittest.TestCase):
+    """Mus errors carry a single message argument, like other exceptions."""
+
+    def test_args_hold_only_the_message(self) -> None:
+        """The line number is kept on the error, not in args."""
+        error = TypeError("bad value", 3)
+        self.assertEqual(error.args, ("bad value",))
+        self.assertEqual(error.line_number, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests for reused call frames.
+"""
+
+import unittest
+
+from tests.support import run_program
+
+class CallFrameTest(unittest.TestCase):
+    """Reusing a call's frame never leaks state between calls."""
+
+    def test_locals_start_fresh_on_each_call(self) -> None:
+        """Locals of a reused frame don't keep values from earlier calls."""
+        source = """
+fun add(n => integer) {
+  var total => integer = 0
+  total = total + n
+  return total
+}
+out(add(1))
+out(add(2))
+"""
+        self.assertEqual(run_program(source), ["1", "2"])
+
+    def test_recursive_calls_keep_their_own_locals(self) -> None:
+        """A nested call of the same function gets a separate frame."""
+        source = """
+var calls => integer = 0
+fun depth(n => integer) {
+  var mine => integer = n * 10
+  calls = calls + 1
+  if (n > 0) { depth(n - 1) }
+  return mine
+}
+out(depth(3))
+out(calls)
+"""
+        self.assertEqual(run_program(source), ["30", "4"])
+
+    def test_closures_keep_the_frame_they_capture(self) -> None:
+        """Functions declared in a call keep that call's locals."""
+        source = """
+fun make(n => integer) {
+  fun get() { return n }
+  return get
+}
+var a => any = make(1)
+var b => any = make(2)
+out(a())
+out(b())
+"""
+        self.assertEqual(run_program(source), ["1", "2"])
+
+    def test_methods_keep_the_frame_they_capture(self) -> None:
+        """Classes declared in a call keep that call's locals."""
+        source = """
+fun box(n => integer) {
+  class Box { fun value() { return n } }
+  return new Box()
+}
+var p => any = box(3)
+var q => any = box(4)
+out(p.value())
+out(q.value())
+"""
+        self.assertEqual(run_program(source), ["3", "4"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests for compiled numeric loops.
+"""
+
+import unittest
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from unittest import mock
+
+from mus.core import interpreter
+from mus.core.jit import HOT_LOOP_ITERATIONS, LoopKernel, compile_loop
+from mus.core.parser import While
+from tests.support import run_program
+
+def run_interpreted(source: str) -> List[str]:
+    """Run a Mus program with loop compilation turned off."""
+    with mock.patch.object(interpreter, 'compile_loop', return_value=None):
+        return run_program(source)
+
+@contextmanager
+def recording_kernels() -> Iterator[List[Optional[LoopKernel]]]:
+    """Record the result of every loop compilation made inside the block."""
+    kernels: List[Optional[LoopKernel]] = []
+    def compile_and_record(stmt: While) -> Optional[LoopKernel]:
+        kernels.append(compile_loop(stmt))
+        return kernels[-1]
+    with mock.patch.object(interpreter, 'compile_loop', compile_and_record):
+        yield kernels
+
+def counting_loop(iterations: int, body: str) -> str:
+    """Build a program that runs a loop body a given number of times."""
+    return f"""
+var i => integer = 0
+var n => integer = 1
+var x => float = 0.5
+while (i < {iterations}) {{
+  {body}
+  i = i + 1
+}}
+out(i)
+out(n)
+out(x)
+"""
+
+# A loop whose variables are all floats, so numba compiles it when installed
+FLOAT_LOOP = """
+var x => float = 0.5
+var y => float = 100.25
+while (x < y) {
+  x = x * 1.01 + 0.125
+}
+out(x)
+"""
+
+class CompiledLoopTest(unittest.TestCase):
+    """Compiled loops give the same results as interpreted ones."""
+
+    def assert_same_as_interpreted(self, source: str) -> List[str]:
+        """Run a program compiled and interpreted, and compare the output."""
+        with recording_kernels() as kernels:
+            compiled = run_program(source)
+        self.assertEqual(len(kernels), 1)
+        self.assertIsNotNone(kernels[0])
+        self.assertEqual(compiled, run_interpreted(source))
+        return compiled
+
+    def test_hot_loop_takes_over(self) -> None:
+        """A loop is compiled once it is hot, and finishes in the kernel."""
+        output = self.assert_same_as_interpreted(counting_loop(1000, "n = n + i"))
+        self.assertEqual(output[:2], ["1000", str(1 + sum(range(1000)))])
+
+    def test_short_loop_is_interpreted(self) -> None:
+        """A loop that stays below the threshold is never compiled."""
+        source = counting_loop(HOT_LOOP_ITERATIONS - 1, "n = n + i")
+        with recording_kernels() as kernels:
+            output = run_program(source)
+        self.assertEqual(kernels, [])
+        self.assertEqual(output[0], str(HOT_LOOP_ITERATIONS - 1))
+
+    def test_integers_keep_precision(self) -> None:
+        """Integer arithmetic in a kernel does not overflow or round."""
+        output = self.assert_same_as_interpreted(counting_loop(200, "n = n * 3"))
+        self.assertEqual(output[1], str(3 ** 200))
+
+    def test_mixed_int_and_float_arithmetic(self) -> None:
+        """Float and integer variables updated together match the interpreter."""
+        self.assert_same_as_interpreted(counting_loop(300, "x = x * 1.5 - x / 3 + n % 7\n  n = n + i"))
+
+    def test_float_only_loop(self) -> None:
+        """A loop over nothing but floats matches the interpreter."""
+        self.assert_same_as_interpreted(FLOAT_LOOP)
+
+    def test_native_kernel_matches_python(self) -> None:
+        """The numba kernel for float loops gives Python's results."""
+        with recording_kernels() as kernels:
+            run_program(FLOAT_LOOP)
+        kernel = kernels[0]
+        assert kernel is not None
+        if kernel.float_function is None:
+            self.skipTest("numba is not installed")
+        self.assertEqual(kernel.float_function(0.5, 100.25), kernel.function(0.5, 100.25))
+
+    def test_int_assignment_keeps_python_kernel(self) -> None:
+        """An int stored into a float variable stays an int under numba."""
+        source = """
+fun f() {
+  var x => float = 0.5
+  var y => float = 0.0
+  while (x < 100.0) {
+    x = x + 1.0
+    y = 3
+  }
+  return y
+}
+out(f())
+out(f())
+"""
+        with recording_kernels() as kernels:
+            output = run_program(source)
+        # The second call starts with only floats, where the native kernel
+        # would otherwise be picked
+        self.assertEqual(output, ["3", "3"])
+        self.assertEqual(output, run_interpreted(source))
+        self.assertEqual(len(kernels), 1)
+        assert kernels[0] is not None
+        self.assertIsNone(kernels[0].float_function)
+
+    def test_float_division_by_zero_falls_back(self) -> None:
+        """Float division by zero is reported the same way on every path."""
+        source = """
+var x => float = 0.5
+var d => float = 60.0
+while (x < 1000.0) {
+  x = x + 1.0 / d - x % -3.5
+  d = d - 1.0
+}
+out(x)
+"""
+        output = self.assert_same_as_interpreted(source)
+        self.assertIn("Division by zero", output[0])
+
+    def test_arithmetic_error_falls_back(self) -> None:
+        """Division by zero inside a kernel is reported by the interpreter."""
+        output = self.assert_same_as_interpreted(counting_loop(100, "x = x + 1 / (80 - i)"))
+        self.assertEqual(len(output), 1)
+        self.assertIn("Division by zero", output[0])
+        self.assertTrue(output[0].startswith("[line 6, column"))
+
+    def test_non_finite_literal_is_interpreted(self) -> None:
+        """A loop using a literal that folds to infinity stays interpreted."""
+        big = "9" * 200 + ".0"
+        source = counting_loop(100, f"x = x + {big} * {big}")
+        with recording_kernels() as kernels:
+            output = run_program(source)
+        self.assertEqual(kernels, [None])
+        self.assertEqual(output, ["100", "1", "inf"])
+        self.assertEqual(output, run_interpreted(source))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for the legacy line-based lexer in mus/lexer.py.
+"""
+
+import sys
+import unittest
+from typing import List, Tuple
+
+from mus.exceptions import ParserError
+from mus.lexer import Lexer
+from mus.tokens import TokenType
+
+def lex(source: str) -> List[Tuple[str, str, int]]:
+    """Tokenize source into (type name, value, line) triples."""
+    return [(token.type.name, token.value, token.line) for token in Lexer(source).tokenize()]
+
+class TokenOutputTest(unittest.TestCase):
+    """The regex scanner produces the tokens the character loop did."""
+
+    def test_declaration_and_call(self) -> None:
+        """Keywords, types, names, numbers and separators are classified."""
+        self.assertEqual(lex('var x => integer = 42\nout(x)'), [
+            ('KEYWORD', 'var', 1), ('IDENTIFIER', 'x', 1), ('OPERATOR', '=>', 1),
+            ('TYPE', 'integer', 1), ('OPERATOR', '=', 1), ('NUMBER', '42', 1),
+            ('KEYWORD', 'out', 2), ('SEPARATOR', '(', 2), ('IDENTIFIER', 'x', 2),
+            ('SEPARATOR', ')', 2),
+        ])
+
+    def test_comments_are_skipped(self) -> None:
+        """A -- comment runs to the end of its line."""
+        self.assertEqual(lex('return a + b -- sum\n}'), [
+            ('KEYWORD', 'return', 1), ('IDENTIFIER', 'a', 1), ('OPERATOR', '+', 1),
+            ('IDENTIFIER', 'b', 1), ('SEPARATOR', '}', 2),
+        ])
+
+    def test_two_character_operators(self) -> None:
+        """Two-character operators are matched before their first character."""
+        self.assertEqual(lex('a_1 <= b2 => c . d != !e'), [
+            ('IDENTIFIER', 'a_1', 1), ('OPERATOR', '<=', 1), ('IDENTIFIER', 'b2', 1),
+            ('OPERATOR', '=>', 1), ('IDENTIFIER', 'c', 1), ('OPERATOR', '.', 1),
+            ('IDENTIFIER', 'd', 1), ('OPERATOR', '!=', 1), ('OPERATOR', '!', 1),
+            ('IDENTIFIER', 'e', 1),
+        ])
+
+    def test_string_escapes(self) -> None:
+        """Known escapes stay escaped and unknown ones are dropped."""
+        self.assertEqual(lex('"a\\"b\\nc\\qd\\\\"'), [('STRING', 'a\\"b\\ncd\\\\', 1)])
+
+    def test_newlines_in_strings_do_not_count(self) -> None:
+        """Line numbers only advance on newlines outside string literals."""
+        self.assertEqual(lex('out("one\ntwo")\n!z'), [
+            ('KEYWORD', 'out', 1), ('SEPARATOR', '(', 1), ('STRING', 'one\ntwo', 1),
+            ('SEPARATOR', ')', 1), ('OPERATOR', '!', 2), ('IDENTIFIER', 'z', 2),
+        ])
+
+    def test_unterminated_string_runs_to_the_end(self) -> None:
+        """A string without a closing quote takes the rest of the source."""
+        self.assertEqual(lex('"open\nstring'), [('STRING', 'open\nstring', 1)])
+
+    def test_lone_ampersand_is_invalid(self) -> None:
+        """'&' is not an operator on its own, and '&&' is not one either."""
+        for source in ('x = 1 & 2', '\nif (a && b) {}'):
+            with self.assertRaises(ParserError) as caught:
+                Lexer(source).tokenize()
+            self.assertEqual(caught.exception.raw_message, "Invalid character: &")
+        self.assertEqual(caught.exception.line_number, 2)
+
+class InterningTest(unittest.TestCase):
+    """Names share one string object wherever they appear."""
+
+    def test_identifiers_are_interned(self) -> None:
+        """The same name from two sources is the same object."""
+        name = ''.join(['coun', 'ter'])
+        first = Lexer(f'{name} = 1').tokenize()[0].value
+        second = Lexer(f'out({name})').tokenize()[2].value
+        self.assertIs(first, second)
+        self.assertIs(first, sys.intern(name))
+
+    def test_reserved_words_keep_their_types(self) -> None:
+        """Keywords and type names are classified by the single lookup."""
+        self.assertEqual(lex('class A extends B { new this.x }'), [
+            ('KEYWORD', 'class', 1), ('IDENTIFIER', 'A', 1), ('KEYWORD', 'extends', 1),
+            ('IDENTIFIER', 'B', 1), ('SEPARATOR', '{', 1), ('KEYWORD', 'new', 1),
+            ('KEYWORD', 'this', 1), ('OPERATOR', '.', 1), ('IDENTIFIER', 'x', 1),
+            ('SEPARATOR', '}', 1),
+        ])
+        self.assertEqual([name for name, _, _ in lex('string integer bool array boolean')],
+                         ['TYPE', 'TYPE', 'TYPE', 'TYPE', 'IDENTIFIER'])
+
+class TokenStreamTest(unittest.TestCase):
+    """scan() stores the same tokens as parallel columns."""
+
+    SOURCE = 'var t => array<integer> = [1, 2];\nt.push("x")\n'
+
+    def test_columns_match_tokens(self) -> None:
+        """kind, text and line agree with the Token list for every index."""
+        stream = Lexer(self.SOURCE).scan()
+        tokens = Lexer(self.SOURCE).tokenize()
+        self.assertEqual(len(stream), len(tokens))
+        for index, token in enumerate(tokens):
+            self.assertEqual(stream.kind(index), token.type.value)
+            self.assertEqual(stream.text(index), token.value)
+            self.assertEqual(stream.line(index), token.line)
+
+    def test_to_tokens_rebuilds_the_token_list(self) -> None:
+        """to_tokens() gives back the Token objects tokenize() returns."""
+        tokens = Lexer(self.SOURCE).scan().to_tokens()
+        self.assertEqual([(token.type.name, token.value, token.line) for token in tokens],
+                         lex(self.SOURCE))
+        self.assertEqual(tokens[-2].type, TokenType.STRING)
+        self.assertEqual(tokens[-2].line, 2)
+
+    def test_empty_source(self) -> None:
+        """Source with only whitespace and comments gives an empty stream."""
+        stream = Lexer('  -- nothing here\n').scan()
+        self.assertEqual(len(stream), 0)
+        self.assertEqual(stream.to_tokens(), [])
+
+if __name__ == '__main__':
+    unittest.main()
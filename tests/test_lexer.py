@@ -0,0 +1,26 @@
+"""
+Tests for the core lexer.
+"""
+
+import unittest
+
+from mus.core.lexer import Lexer, TokenType
+from tests.support import run_program
+
+class StringLiteralTest(unittest.TestCase):
+    """String literals keep their text as written."""
+
+    def test_backslashes_are_not_decoded(self) -> None:
+        """Backslash sequences stay as two characters."""
+        tokens = Lexer('"C:\\temp" "a\\nb"').scan_tokens()
+        self.assertEqual([token.type for token in tokens],
+                         [TokenType.STRING, TokenType.STRING, TokenType.EOF])
+        self.assertEqual(tokens[0].literal, 'C:\\temp')
+        self.assertEqual(tokens[1].literal, 'a\\nb')
+
+    def test_backslash_paths_print_unchanged(self) -> None:
+        """A program printing a Windows path prints it verbatim."""
+        self.assertEqual(run_program('out("C:\\temp")'), ['C:\\temp'])
+
+if __name__ == '__main__':
+    unittest.main()
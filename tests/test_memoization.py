@@ -0,0 +1,42 @@
+"""
+Tests for memoized calls to pure functions.
+"""
+
+import unittest
+
+from tests.support import run_program
+
+class MemoizationTest(unittest.TestCase):
+    """Memoized calls must agree with unmemoized ones."""
+
+    def test_pure_recursion_is_computed(self) -> None:
+        """A recursive pure function returns the same values as without a cache."""
+        source = """
+fun fib(n => integer) {
+  if (n < 2) { return n }
+  return fib(n - 1) + fib(n - 2)
+}
+out(fib(20))
+out(fib(20))
+"""
+        self.assertEqual(run_program(source), ["6765", "6765"])
+
+    def test_redeclared_name_bypasses_stale_results(self) -> None:
+        """A kept reference follows the name its self-call now reaches."""
+        source = """
+fun f(n => integer) {
+  if (n < 1) { return 0 }
+  return f(n - 1) + 1
+}
+var old => any = f
+out(old(5))
+fun f(n => integer) {
+  return 100 + n
+}
+out(old(5))
+out(old(6))
+"""
+        self.assertEqual(run_program(source), ["5", "105", "106"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests for resolved local variable slots.
+"""
+
+import unittest
+
+from tests.support import run_program
+
+class SlotResolutionTest(unittest.TestCase):
+    """Locals resolve to the declaration in the nearest enclosing scope."""
+
+    def test_nested_blocks_shadow_outer_locals(self) -> None:
+        """Inner declarations shadow outer ones only inside their block."""
+        source = """
+var g => integer = 1
+fun outer(a => integer) {
+  var b => integer = a + 1
+  {
+    var b => integer = 100
+    {
+      var c => integer = a + b + g
+      out(c)
+    }
+    out(b)
+  }
+  out(b)
+}
+outer(5)
+"""
+        self.assertEqual(run_program(source), ["106", "100", "6"])
+
+    def test_nested_function_reads_enclosing_locals(self) -> None:
+        """A nested function sees the enclosing call's current values."""
+        source = """
+var g => integer = 1
+fun outer(a => integer) {
+  var b => integer = a + 1
+  fun inner(d => integer) {
+    return a + b + d + g
+  }
+  b = b + 10
+  return inner(1000)
+}
+out(outer(5))
+g = 2
+out(outer(7))
+"""
+        self.assertEqual(run_program(source), ["1022", "1027"])
+
+    def test_assignment_updates_the_resolved_scope(self) -> None:
+        """Assignments write to the declaration they resolve to."""
+        source = """
+var x => integer = 1
+{
+  var y => integer = 2
+  {
+    x = x + 10
+    y = y + 20
+  }
+  out(y)
+}
+out(x)
+"""
+        self.assertEqual(run_program(source), ["22", "11"])
+
+class SuperSlotTest(unittest.TestCase):
+    """'super' in a method refers to the parent of the declaring class."""
+
+    def test_three_levels_of_inheritance(self) -> None:
+        """Each super call moves one class up, whatever the instance's class."""
+        source = """
+class A {
+  fun hi() { return "A" }
+}
+class B extends A {
+  fun hi() { return "B" + super.hi() }
+}
+class C extends B {}
+class D extends C {
+  fun hi() { return "D" + super.hi() }
+}
+out(new B().hi())
+out(new C().hi())
+out(new D().hi())
+"""
+        self.assertEqual(run_program(source), ["BA", "BA", "DBA"])
+
+if __name__ == '__main__':
+    unittest.main()